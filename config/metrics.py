@@ -0,0 +1,341 @@
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import Http404, HttpResponse
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERIES_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Метрика: (описание, границы корзин).
+METRICS = {
+    "duration_seconds": ("Полное время обработки", SECONDS_BUCKETS),
+    "db_seconds": ("Время выполнения SQL-запросов", SECONDS_BUCKETS),
+    "serializer_seconds": ("Время работы сериализаторов", SECONDS_BUCKETS),
+    "queries": ("Количество SQL-запросов", QUERIES_BUCKETS),
+}
+METRICS_PREFIX = "habits_"
+
+# Замер текущего запроса или задачи (None - замер не ведется).
+_current_sample = ContextVar("metrics_sample", default=None)
+
+
+class Sample:
+    """
+    Замер одного запроса или задачи.
+
+    Attributes:
+        queries (int): Количество SQL-запросов
+        db (float): Время выполнения SQL-запросов (с)
+        serializer (float): Время работы сериализаторов (с)
+        depth (int): Глубина вложенных замеров сериализаторов
+    """
+
+    __slots__ = ("queries", "db", "serializer", "depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.depth = 0
+
+
+class Histogram:
+    """
+    Гистограмма одной метрики по меткам (kind, name) в памяти процесса.
+
+    Attributes:
+        buckets (tuple): Верхние границы корзин
+        series (dict): Счетчики корзин, сумма и количество по меткам
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        """Добавляет наблюдение в серию с метками labels."""
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = {
+                "counts": [0] * len(self.buckets),
+                "sum": 0.0,
+                "count": 0,
+            }
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["counts"][i] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+
+class Registry:
+    """Потокобезопасный набор гистограмм процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает все накопленные наблюдения."""
+        self.histograms = {
+            metric: Histogram(buckets) for metric, (_, buckets) in METRICS.items()
+        }
+
+    def observe(self, kind, name, sample, duration):
+        """
+        Записывает замер запроса или задачи.
+
+        Args:
+            kind (str): Тип замера (view или task)
+            name (str): Имя представления или задачи
+            sample (Sample): Замер
+            duration (float): Полное время обработки (с)
+        """
+        labels = (kind, name)
+        with self.lock:
+            self.histograms["duration_seconds"].observe(labels, duration)
+            self.histograms["db_seconds"].observe(labels, sample.db)
+            self.histograms["serializer_seconds"].observe(labels, sample.serializer)
+            self.histograms["queries"].observe(labels, sample.queries)
+
+    def render(self):
+        """
+        Возвращает все гистограммы в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст для экспорта метрик
+        """
+        lines = []
+        with self.lock:
+            for metric, (description, _) in METRICS.items():
+                histogram = self.histograms[metric]
+                full_name = METRICS_PREFIX + metric
+                lines.append(f"# HELP {full_name} {description}")
+                lines.append(f"# TYPE {full_name} histogram")
+                for (kind, name), series in sorted(histogram.series.items()):
+                    labels = f'kind="{kind}",name="{name}"'
+                    for bound, count in zip(histogram.buckets, series["counts"]):
+                        lines.append(
+                            f'{full_name}_bucket{{{labels},le="{bound}"}} {count}'
+                        )
+                    lines.append(
+                        f'{full_name}_bucket{{{labels},le="+Inf"}} {series["count"]}'
+                    )
+                    lines.append(f"{full_name}_sum{{{labels}}} {series['sum']}")
+                    lines.append(f"{full_name}_count{{{labels}}} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def record_query(execute, sql, params, many, context):
+    """Обертка выполнения SQL, учитывающая запрос в текущем замере."""
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample = _current_sample.get()
+        if sample is not None:
+            sample.queries += 1
+            sample.db += time.perf_counter() - started_at
+
+
+def start_sample(sample=None):
+    """
+    Начинает замер и подключает учет SQL-запросов.
+
+    Args:
+        sample (Sample): Продолжаемый замер (по умолчанию новый)
+
+    Returns:
+        tuple: Замер, токен контекста и признак подключения обертки
+    """
+    if sample is None:
+        sample = Sample()
+    token = _current_sample.set(sample)
+    added = record_query not in connection.execute_wrappers
+    if added:
+        connection.execute_wrappers.append(record_query)
+    return sample, token, added
+
+
+def finish_sample(token, added):
+    """Завершает замер, начатый start_sample."""
+    if added:
+        connection.execute_wrappers.remove(record_query)
+    _current_sample.reset(token)
+
+
+@contextmanager
+def serializer_timer():
+    """Учитывает время блока как время сериализации в текущем замере."""
+    sample = _current_sample.get()
+    if sample is None or sample.depth:
+        yield
+        return
+    sample.depth += 1
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.depth -= 1
+        sample.serializer += time.perf_counter() - started_at
+
+
+def timed_serializer(func):
+    """Оборачивает метод сериализатора в serializer_timer."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with serializer_timer():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def format_server_timing(sample, duration):
+    """
+    Возвращает значение заголовка Server-Timing.
+
+    Args:
+        sample (Sample): Замер
+        duration (float): Полное время обработки (с)
+
+    Returns:
+        str: Значение заголовка (длительности в миллисекундах)
+    """
+    return ", ".join(
+        [
+            f'db;dur={sample.db * 1000:.2f};desc="{sample.queries} queries"',
+            f"serializer;dur={sample.serializer * 1000:.2f}",
+            f"total;dur={duration * 1000:.2f}",
+        ]
+    )
+
+
+class MetricsMiddleware:
+    """
+    Middleware замера запросов: количество и время SQL-запросов, время
+    сериализаторов и полное время по имени представления.
+
+    Добавляет заголовок Server-Timing и пишет замер в гистограммы процесса.
+    Тело потокового ответа формируется уже после выхода из middleware, поэтому
+    его замер продолжается при чтении тела и записывается после его окончания;
+    Server-Timing такого ответа покрывает только время до отправки заголовков.
+    При METRICS_ENABLED=False отключается при старте (MiddlewareNotUsed).
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started_at = time.perf_counter()
+        sample, token, added = start_sample()
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_sample(token, added)
+        duration = time.perf_counter() - started_at
+
+        match = request.resolver_match
+        name = match.view_name if match is not None else "unresolved"
+        response["Server-Timing"] = format_server_timing(sample, duration)
+        if response.streaming and not response.is_async:
+            response.streaming_content = measure_stream(
+                response.streaming_content, name, sample, started_at
+            )
+        else:
+            registry.observe("view", name, sample, duration)
+        return response
+
+
+def measure_stream(content, name, sample, started_at):
+    """
+    Продолжает замер запроса на время формирования тела потокового ответа.
+
+    Args:
+        content (iterator): Тело ответа
+        name (str): Имя представления
+        sample (Sample): Замер запроса
+        started_at (float): Начало обработки запроса (time.perf_counter)
+
+    Yields:
+        bytes: Части тела ответа
+    """
+    iterator = iter(content)
+    try:
+        while True:
+            _, token, added = start_sample(sample)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                finish_sample(token, added)
+            yield chunk
+    finally:
+        registry.observe("view", name, sample, time.perf_counter() - started_at)
+
+
+_task_samples = {}
+
+
+def start_task_sample(task_id=None, **kwargs):
+    """Начинает замер задачи Celery (сигнал task_prerun)."""
+    _task_samples[task_id] = (time.perf_counter(), *start_sample())
+
+
+def finish_task_sample(task_id=None, task=None, **kwargs):
+    """Завершает замер задачи Celery и записывает его (сигнал task_postrun)."""
+    started = _task_samples.pop(task_id, None)
+    if started is None:
+        return
+    started_at, sample, token, added = started
+    finish_sample(token, added)
+    registry.observe("task", task.name, sample, time.perf_counter() - started_at)
+
+
+def install():
+    """
+    Подключает замер сериализаторов DRF и задач Celery.
+
+    Вызывается при старте приложения, только если METRICS_ENABLED.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    if getattr(BaseSerializer, "_metrics_installed", False):
+        return
+    BaseSerializer.data = property(timed_serializer(BaseSerializer.data.fget))
+    BaseSerializer.is_valid = timed_serializer(BaseSerializer.is_valid)
+    BaseSerializer._metrics_installed = True
+    task_prerun.connect(start_task_sample, weak=False)
+    task_postrun.connect(finish_task_sample, weak=False)
+
+
+def metrics_view(request):
+    """
+    Отдает гистограммы процесса в текстовом формате Prometheus.
+
+    Требует заголовок Authorization: Bearer <METRICS_TOKEN>. Без заданного
+    METRICS_TOKEN эндпоинт недоступен.
+    """
+    token = settings.METRICS_TOKEN
+    if not settings.METRICS_ENABLED or not token:
+        raise Http404
+    authorization = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
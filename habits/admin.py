@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.admin import ModelAdmin
 
-from habits.models import Habit, Periodicity
+from habits.models import Habit, Periodicity, ReminderDelivery
 
 
 @admin.register(Periodicity)
@@ -27,3 +27,11 @@ class HabitAdmin(ModelAdmin):
         "time_to_complete",
         "publicity",
     )
+
+
+@admin.register(ReminderDelivery)
+class ReminderDeliveryAdmin(ModelAdmin):
+    """Административный интерфейс для модели ReminderDelivery."""
+
+    list_display = ("habit", "occurrence", "created_at")
+    list_filter = ("occurrence",)
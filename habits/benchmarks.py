@@ -0,0 +1,182 @@
+import json
+import random
+import subprocess
+from datetime import time
+
+from django.db import transaction
+
+from habits.models import Habit, Periodicity
+from habits.services import get_first_reminder_at, get_period
+from users.models import User
+
+# (value, unit, вес): большинство привычек ежедневные, встречаются и минутные.
+PERIODICITY_WEIGHTS = [
+    (1, "days", 60),
+    (2, "days", 8),
+    (3, "days", 7),
+    (1, "week", 10),
+    (1, "hours", 4),
+    (3, "hours", 4),
+    (15, "minutes", 3),
+    (30, "minutes", 4),
+]
+
+TG_CHAT_RATIO = 0.7
+
+
+class BenchmarkRollback(Exception):
+    """Откатывает транзакцию с синтетическими данными после замера."""
+
+
+def random_habit_time(rng):
+    """
+    Возвращает время привычки с утренним и вечерним пиками.
+
+    Args:
+        rng (random.Random): Генератор случайных чисел
+
+    Returns:
+        time: Время выполнения привычки с точностью до минуты
+    """
+    roll = rng.random()
+    if roll < 0.45:
+        minutes = rng.gauss(8 * 60, 40)
+    elif roll < 0.75:
+        minutes = rng.gauss(20 * 60 + 30, 60)
+    else:
+        minutes = rng.uniform(0, 24 * 60)
+    minutes = int(minutes) % (24 * 60)
+    return time(minutes // 60, minutes % 60)
+
+
+def generate_users(count, rng):
+    """
+    Создает синтетических пользователей.
+
+    Args:
+        count (int): Количество пользователей
+        rng (random.Random): Генератор случайных чисел
+
+    Returns:
+        list[User]: Созданные пользователи
+    """
+    users = []
+    for i in range(count):
+        user = User(email=f"bench{i}@example.com", is_active=True)
+        user.set_unusable_password()
+        if rng.random() < TG_CHAT_RATIO:
+            user.tg_chat_id = str(10**9 + i)
+        users.append(user)
+    return User.objects.bulk_create(users, batch_size=1000)
+
+
+def generate_periodicities():
+    """
+    Возвращает периодичности для синтетических привычек (создает недостающие).
+
+    Returns:
+        tuple: Список периодичностей и список их весов
+    """
+    periodicities = []
+    weights = []
+    for value, unit, weight in PERIODICITY_WEIGHTS:
+        periodicity = Periodicity.objects.filter(value=value, unit=unit).first()
+        if periodicity is None:
+            periodicity = Periodicity.objects.create(value=value, unit=unit)
+        periodicities.append(periodicity)
+        weights.append(weight)
+    return periodicities, weights
+
+
+def generate_habits(count, users, rng):
+    """
+    Создает синтетические привычки.
+
+    Привычки распределяются между пользователями неравномерно (по закону Парето):
+    у немногих пользователей много привычек, у большинства - по одной-две.
+
+    Args:
+        count (int): Количество привычек
+        users (list[User]): Пользователи - создатели привычек
+        rng (random.Random): Генератор случайных чисел
+
+    Returns:
+        list[Habit]: Созданные привычки
+    """
+    periodicities, weights = generate_periodicities()
+    user_weights = [rng.paretovariate(1.2) for _ in users]
+    creators = rng.choices(users, weights=user_weights, k=count)
+    chosen_periodicities = rng.choices(periodicities, weights=weights, k=count)
+    habits = []
+    for i, (creator, periodicity) in enumerate(zip(creators, chosen_periodicities)):
+        habit_time = random_habit_time(rng)
+        habits.append(
+            Habit(
+                creator=creator,
+                place=f"Место {i % 50}",
+                habit_time=habit_time,
+                action=f"Действие {i}",
+                periodicity=periodicity,
+                reward="Награда" if rng.random() < 0.5 else None,
+                time_to_complete=rng.randint(10, 120),
+                publicity=rng.random() < 0.3,
+                next_reminder_at=get_first_reminder_at(
+                    habit_time, get_period(periodicity), tz=creator.get_timezone()
+                ),
+            )
+        )
+    return Habit.objects.bulk_create(habits, batch_size=1000)
+
+
+def run_with_synthetic_data(users, habits, seed, measure):
+    """
+    Создает синтетические данные, выполняет замер и откатывает все изменения.
+
+    Args:
+        users (int): Количество пользователей
+        habits (int): Количество привычек
+        seed (int): Зерно генератора случайных чисел
+        measure (callable): Функция замера, принимает список созданных привычек
+
+    Returns:
+        dict: Результат measure
+    """
+    rng = random.Random(seed)
+    result = {}
+    try:
+        with transaction.atomic():
+            created_users = generate_users(users, rng)
+            created_habits = generate_habits(habits, created_users, rng)
+            result = measure(created_habits)
+            raise BenchmarkRollback
+    except BenchmarkRollback:
+        pass
+    return result
+
+
+def get_git_commit():
+    """Возвращает хеш текущего коммита или None, если он недоступен."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(report, output=None, stdout=None):
+    """
+    Выводит отчет о замере в формате JSON.
+
+    Args:
+        report (dict): Отчет
+        output (str): Путь к файлу отчета (None - вывод в stdout)
+        stdout (OutputWrapper): Поток вывода management-команды
+    """
+    report = {"commit": get_git_commit(), **report}
+    content = json.dumps(report, ensure_ascii=False, indent=2, default=str)
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(content)
+    if stdout is not None:
+        stdout.write(content)
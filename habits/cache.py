@@ -0,0 +1,144 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from habits.models import Periodicity
+
+PUBLIC_HABITS_VERSION_KEY = "habits:public:version"
+PUBLIC_HABITS_QUERY_PARAMS = ("page", "page_size", "pagination", "cursor", "count")
+PERIODICITY_VERSION_KEY = "habits:periodicity:version"
+
+# Таблица периодичностей процесса: версия, время загрузки и объекты по id.
+_periodicity_table = {"version": None, "loaded_at": None, "objects": {}}
+
+
+def get_version(key):
+    """
+    Возвращает текущую версию кешированных данных.
+
+    Начальная версия берется из текущего времени, чтобы после вытеснения
+    счетчика из кеша не совпасть с версией уже закешированных данных.
+
+    Args:
+        key (str): Ключ счетчика версии
+
+    Returns:
+        int: Версия
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _increment_version(key):
+    """Увеличивает счетчик версии (или создает его заново, если он вытеснен)."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_version(key):
+    """
+    Инвалидирует данные, закешированные под текущей версией.
+
+    Версия увеличивается сразу и еще раз после фиксации транзакции: иначе
+    параллельный запрос мог бы закешировать еще не зафиксированное состояние
+    под новой версией.
+
+    Args:
+        key (str): Ключ счетчика версии
+    """
+    _increment_version(key)
+    transaction.on_commit(lambda: _increment_version(key))
+
+
+def get_public_habits_version():
+    """Возвращает текущую версию кеша публичных привычек."""
+    return get_version(PUBLIC_HABITS_VERSION_KEY)
+
+
+def bump_public_habits_version():
+    """Инвалидирует все закешированные страницы публичных привычек."""
+    bump_version(PUBLIC_HABITS_VERSION_KEY)
+
+
+def get_public_habits_cache_key(request):
+    """
+    Возвращает ключ кеша страницы публичных привычек.
+
+    Ключ зависит от версии кеша, схемы и хоста (в ответе есть абсолютные ссылки next/previous)
+    и параметров пагинации запроса.
+
+    Args:
+        request (Request): Запрос к ленте публичных привычек
+
+    Returns:
+        str: Ключ кеша
+    """
+    params = [
+        (name, request.query_params.get(name))
+        for name in PUBLIC_HABITS_QUERY_PARAMS
+        if name in request.query_params
+    ]
+    digest = hashlib.md5(
+        repr((request.scheme, request.get_host(), params)).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f"habits:public:{get_public_habits_version()}:{digest}"
+
+
+def get_public_habits_etag(data):
+    """
+    Возвращает ETag страницы публичных привычек по ее содержимому.
+
+    ETag не зависит от версии кеша: без общего кеша версия своя в каждом
+    процессе, и одинаковый ETag для разного содержимого давал бы неверный 304.
+
+    Args:
+        data (dict): Данные страницы
+
+    Returns:
+        str: Значение заголовка ETag
+    """
+    content = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    digest = hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def get_periodicity_table():
+    """
+    Возвращает все периодичности из памяти процесса.
+
+    Таблица загружается из БД одним запросом и перечитывается, когда версия
+    в кеше изменилась (bump_periodicity_version) или прошло
+    PERIODICITY_TABLE_TIMEOUT секунд. Без общего кеша (CACHE_URL) версия своя
+    в каждом процессе, и изменения из других процессов видны только по таймауту.
+
+    Returns:
+        dict: Объекты Periodicity по id
+    """
+    version = get_version(PERIODICITY_VERSION_KEY)
+    now = time.monotonic()
+    loaded_at = _periodicity_table["loaded_at"]
+    if (
+        _periodicity_table["version"] != version
+        or loaded_at is None
+        or now - loaded_at >= settings.PERIODICITY_TABLE_TIMEOUT
+    ):
+        _periodicity_table["objects"] = Periodicity.objects.in_bulk()
+        _periodicity_table["version"] = version
+        _periodicity_table["loaded_at"] = now
+    return _periodicity_table["objects"]
+
+
+def bump_periodicity_version():
+    """Помечает таблицы периодичностей всех процессов устаревшими."""
+    bump_version(PERIODICITY_VERSION_KEY)
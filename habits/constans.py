@@ -5,4 +5,13 @@ ERROR_MESSAGES = [
     "У приятной привычки не может быть вознаграждения или связанной привычки",
     "Нельзя выполнять привычку реже, чем 1 раз в 7 дней",
     "Нельзя выполнять привычку реже, чем 1 раз в неделю",
+    "Привычка не найдена.",
+    "Привычка указана в запросе несколько раз.",
+    "Слишком много привычек в одном запросе (максимум {}).",
+    "Неизвестный формат выгрузки. Допустимые значения: {}.",
+    "Выгрузка всех публичных привычек доступна только персоналу.",
+    "Обязательное поле.",
+    "Некорректное значение.",
+    "Пользователь не найден.",
+    "Периодичность не найдена.",
 ]
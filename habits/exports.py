@@ -0,0 +1,64 @@
+import csv
+import json
+
+from habits.serializers import serialize_habit_row
+
+EXPORT_COLUMNS = (
+    "id",
+    "related_habit",
+    "periodicity",
+    "periodicity_display",
+    "place",
+    "habit_time",
+    "action",
+    "enjoyable_habit",
+    "reward",
+    "time_to_complete",
+    "publicity",
+)
+
+
+class EchoBuffer:
+    """Буфер для csv.writer, возвращающий записанную строку вместо ее хранения."""
+
+    def write(self, value):
+        """Возвращает переданную строку."""
+        return value
+
+
+def render_ndjson(rows):
+    """
+    Построчно выводит привычки в формате NDJSON (один JSON-объект на строку).
+
+    Args:
+        rows (Iterable[dict]): Строки привычек с полями HABIT_VALUES_FIELDS
+
+    Yields:
+        str: Строка NDJSON
+    """
+    for row in rows:
+        yield json.dumps(serialize_habit_row(row), ensure_ascii=False) + "\n"
+
+
+def render_csv(rows):
+    """
+    Построчно выводит привычки в формате CSV с заголовком.
+
+    Args:
+        rows (Iterable[dict]): Строки привычек с полями HABIT_VALUES_FIELDS
+
+    Yields:
+        str: Строка CSV
+    """
+    writer = csv.writer(EchoBuffer())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        habit = serialize_habit_row(row)
+        yield writer.writerow([habit[column] for column in EXPORT_COLUMNS])
+
+
+# Формат выгрузки: (content type, расширение файла, функция вывода).
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson", render_ndjson),
+    "csv": ("text/csv; charset=utf-8", "csv", render_csv),
+}
@@ -0,0 +1,320 @@
+import csv
+import io
+import json
+from datetime import time
+from zoneinfo import ZoneInfo
+
+from django.db import connection, transaction
+
+from habits.cache import bump_public_habits_version, get_periodicity_table
+from habits.constans import ERROR_MESSAGES
+from habits.models import Habit
+from habits.services import get_first_reminder_at, get_unit_period
+from habits.validators import validate_habits
+from users.models import User
+
+TRUE_VALUES = {"true", "1", "t", "yes"}
+FALSE_VALUES = {"false", "0", "f", "no", ""}
+
+# Колонки таблицы привычек, заполняемые при загрузке через COPY.
+COPY_FIELDS = (
+    "creator",
+    "place",
+    "habit_time",
+    "action",
+    "enjoyable_habit",
+    "related_habit",
+    "periodicity",
+    "reward",
+    "time_to_complete",
+    "publicity",
+    "next_reminder_at",
+)
+
+
+def read_csv(file):
+    """
+    Читает строки привычек из CSV с заголовком.
+
+    Args:
+        file (TextIO): Открытый файл
+
+    Yields:
+        tuple: Номер строки файла и словарь значений
+    """
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(file):
+    """
+    Читает строки привычек из NDJSON (один JSON-объект на строку).
+
+    Args:
+        file (TextIO): Открытый файл
+
+    Yields:
+        tuple: Номер строки файла и словарь значений (None для некорректной строки)
+    """
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def parse_bool(value):
+    """Разбирает логическое значение из CSV/JSON."""
+    if isinstance(value, bool):
+        return value
+    normalized = "" if value is None else str(value).strip().lower()
+    if normalized in TRUE_VALUES:
+        return True
+    if normalized in FALSE_VALUES:
+        return False
+    raise ValueError(value)
+
+
+def parse_pk(value):
+    """Разбирает необязательный первичный ключ (пустое значение - None)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise ValueError(value)
+    return int(value)
+
+
+def parse_text(value, field, required=True):
+    """Разбирает текстовое поле с проверкой обязательности и длины."""
+    value = "" if value is None else str(value).strip()
+    if not value:
+        if required:
+            raise KeyError(field)
+        return None
+    if len(value) > Habit._meta.get_field(field).max_length:
+        raise ValueError(value)
+    return value
+
+
+def parse_row(row):
+    """
+    Разбирает значения одной привычки.
+
+    Args:
+        row (dict): Значения из файла
+
+    Returns:
+        tuple: Разобранные значения и ошибки по полям
+    """
+    parsers = {
+        "place": lambda value: parse_text(value, "place"),
+        "action": lambda value: parse_text(value, "action"),
+        "reward": lambda value: parse_text(value, "reward", required=False),
+        "habit_time": lambda value: time.fromisoformat(str(value)),
+        "time_to_complete": lambda value: int(value),
+        "enjoyable_habit": parse_bool,
+        "publicity": parse_bool,
+        "related_habit": parse_pk,
+    }
+    required = {"place", "action", "habit_time", "time_to_complete"}
+    values = {}
+    errors = {}
+    for field, parse in parsers.items():
+        value = row.get(field)
+        if value in (None, "") and field in required:
+            errors[field] = [ERROR_MESSAGES[11]]
+            continue
+        try:
+            values[field] = parse(value)
+        except KeyError:
+            errors[field] = [ERROR_MESSAGES[11]]
+        except (TypeError, ValueError):
+            errors[field] = [ERROR_MESSAGES[12]]
+    if values.get("time_to_complete", 0) < 0:
+        errors["time_to_complete"] = [ERROR_MESSAGES[12]]
+    try:
+        # Отсутствующая колонка - периодичность по умолчанию, пустое значение - без нее.
+        values["periodicity"] = (
+            parse_pk(row["periodicity"])
+            if "periodicity" in row
+            else Habit._meta.get_field("periodicity").get_default()
+        )
+    except (TypeError, ValueError):
+        errors["periodicity"] = [ERROR_MESSAGES[12]]
+    values["creator_email"] = str(row.get("creator_email") or "").strip()
+    return values, errors
+
+
+def get_creators(emails, create_users=False):
+    """
+    Возвращает создателей привычек пачки одним запросом.
+
+    Args:
+        emails (set[str]): Email создателей
+        create_users (bool): Создать отсутствующих пользователей
+
+    Returns:
+        dict: Пары (id, часовой пояс) по email
+    """
+    creators = {
+        user["email"]: (user["id"], user["timezone"])
+        for user in User.objects.filter(email__in=emails).values(
+            "id", "email", "timezone"
+        )
+    }
+    missing = emails - set(creators)
+    if create_users and missing:
+        users = []
+        for email in missing:
+            user = User(email=email, is_active=True)
+            user.set_unusable_password()
+            users.append(user)
+        for user in User.objects.bulk_create(users):
+            creators[user.email] = (user.pk, user.timezone)
+    return creators
+
+
+def prepare_batch(rows, default_creator=None, create_users=False):
+    """
+    Проверяет пачку строк и готовит привычки к загрузке.
+
+    Проверка векторизована: создатели и связанные привычки пачки загружаются
+    одним запросом каждые, периодичности берутся из таблицы в памяти, правила
+    модели проверяются validate_habits для всей пачки сразу.
+
+    Args:
+        rows (list): Пары (номер строки, значения из файла)
+        default_creator (str): Email создателя для строк без creator_email
+        create_users (bool): Создать отсутствующих пользователей
+
+    Returns:
+        tuple: Готовые привычки и отклоненные строки (номер, ошибки, значения)
+    """
+    parsed = []
+    rejected = []
+    for line, row in rows:
+        if row is None:
+            rejected.append((line, {"non_field_errors": [ERROR_MESSAGES[12]]}, None))
+            continue
+        values, errors = parse_row(row)
+        values["creator_email"] = values["creator_email"] or default_creator or ""
+        if not values["creator_email"]:
+            errors["creator_email"] = [ERROR_MESSAGES[11]]
+        if errors:
+            rejected.append((line, errors, row))
+        else:
+            parsed.append((line, values, row))
+
+    creators = get_creators(
+        {values["creator_email"] for _, values, _ in parsed}, create_users
+    )
+    related_habits = Habit.objects.only("id", "enjoyable_habit").in_bulk(
+        {values["related_habit"] for _, values, _ in parsed} - {None}
+    )
+    periodicities = get_periodicity_table()
+
+    candidates = []
+    for line, values, row in parsed:
+        errors = {}
+        creator = creators.get(values["creator_email"])
+        if creator is None:
+            errors["creator_email"] = [ERROR_MESSAGES[13]]
+        related_habit = related_habits.get(values["related_habit"])
+        if values["related_habit"] is not None and related_habit is None:
+            errors["related_habit"] = [ERROR_MESSAGES[6]]
+        periodicity = periodicities.get(values["periodicity"])
+        if values["periodicity"] is not None and periodicity is None:
+            errors["periodicity"] = [ERROR_MESSAGES[14]]
+        if errors:
+            rejected.append((line, errors, row))
+            continue
+        habit = Habit(
+            creator_id=creator[0],
+            place=values["place"],
+            habit_time=values["habit_time"],
+            action=values["action"],
+            enjoyable_habit=values["enjoyable_habit"],
+            related_habit=related_habit,
+            periodicity_id=values["periodicity"],
+            reward=values["reward"],
+            time_to_complete=values["time_to_complete"],
+            publicity=values["publicity"],
+        )
+        candidates.append((line, habit, row, creator[1], periodicity))
+
+    rule_errors = validate_habits([habit for _, habit, _, _, _ in candidates])
+    habits = []
+    for index, (line, habit, row, tz, periodicity) in enumerate(candidates):
+        if index in rule_errors:
+            rejected.append((line, {"non_field_errors": rule_errors[index]}, row))
+            continue
+        period = get_unit_period(
+            periodicity.value if periodicity else None,
+            periodicity.unit if periodicity else None,
+        )
+        habit.next_reminder_at = get_first_reminder_at(
+            habit.habit_time, period, tz=ZoneInfo(tz)
+        )
+        habits.append(habit)
+    rejected.sort(key=lambda reject: reject[0])
+    return habits, rejected
+
+
+def copy_habits(habits):
+    """
+    Загружает привычки командой COPY (только PostgreSQL).
+
+    Args:
+        habits (list[Habit]): Подготовленные привычки
+    """
+    fields = [Habit._meta.get_field(name) for name in COPY_FIELDS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for habit in habits:
+        writer.writerow(
+            [
+                (
+                    value.isoformat()
+                    if hasattr(value, "isoformat")
+                    else ("" if value is None else value)
+                )
+                for value in (getattr(habit, field.attname) for field in fields)
+            ]
+        )
+    buffer.seek(0)
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    table = connection.ops.quote_name(Habit._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+
+
+def load_habits(habits, batch_size):
+    """
+    Загружает подготовленные привычки одной транзакцией.
+
+    В PostgreSQL используется COPY, в остальных СУБД - bulk_create пачками.
+    Сигналы при этом не отправляются, поэтому кеш ленты публичных привычек
+    сбрасывается явно.
+
+    Args:
+        habits (list[Habit]): Подготовленные привычки
+        batch_size (int): Размер пачки bulk_create
+    """
+    if not habits:
+        return
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            copy_habits(habits)
+        else:
+            Habit.objects.bulk_create(habits, batch_size=batch_size)
+    if any(habit.publicity for habit in habits):
+        bump_public_habits_version()
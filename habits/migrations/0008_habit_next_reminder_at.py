@@ -0,0 +1,75 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:49
+
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+PERIOD_UNITS = {
+    "minutes": "minutes",
+    "hours": "hours",
+    "days": "days",
+    "week": "weeks",
+}
+
+DAY = timedelta(days=1)
+
+BATCH_SIZE = 1000
+
+
+def get_first_reminder_at(habit_time, value, unit, now):
+    """Копия habits.services.get_first_reminder_at на момент миграции."""
+    period = DAY if value is None else timedelta(**{PERIOD_UNITS[unit]: max(value, 1)})
+    local_date = timezone.localtime(now).date()
+    anchor = timezone.make_aware(datetime.combine(local_date, habit_time))
+    if period < DAY:
+        return anchor + ((now - anchor) // period + 1) * period
+    if anchor <= now:
+        anchor = timezone.make_aware(datetime.combine(local_date + DAY, habit_time))
+    return anchor
+
+
+def set_next_reminder_at(apps, schema_editor):
+    Habit = apps.get_model("habits", "Habit")
+
+    now = timezone.now()
+    habits = []
+    rows = (
+        Habit.objects.filter(next_reminder_at__isnull=True)
+        .values_list("id", "habit_time", "periodicity__value", "periodicity__unit")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for habit_id, habit_time, value, unit in rows:
+        habits.append(
+            Habit(
+                id=habit_id,
+                next_reminder_at=get_first_reminder_at(habit_time, value, unit, now),
+            )
+        )
+        if len(habits) == BATCH_SIZE:
+            Habit.objects.bulk_update(habits, ["next_reminder_at"])
+            habits = []
+    Habit.objects.bulk_update(habits, ["next_reminder_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("habits", "0007_alter_habit_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="habit",
+            name="next_reminder_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True,
+                verbose_name="Следующее напоминание",
+            ),
+        ),
+        migrations.RunPython(set_next_reminder_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("habits", "0008_habit_next_reminder_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReminderDelivery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("occurrence", models.DateTimeField(verbose_name="Наступление")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Обработано"),
+                ),
+                (
+                    "habit",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="habits.habit",
+                        verbose_name="Привычка",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Отправка напоминания",
+                "verbose_name_plural": "Отправки напоминаний",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("habit", "occurrence"), name="unique_habit_occurrence"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-16 21:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("habits", "0009_reminderdelivery"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="habit",
+            index=models.Index(fields=["creator", "id"], name="habit_creator_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="habit",
+            index=models.Index(
+                condition=models.Q(("publicity", True)),
+                fields=["id"],
+                name="habit_public_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="habit",
+            index=models.Index(
+                fields=["next_reminder_at", "id"], name="habit_next_reminder_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="habit",
+            name="creator",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Создатель",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="habit",
+            name="next_reminder_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Следующее напоминание",
+            ),
+        ),
+    ]
@@ -1,5 +1,8 @@
+from functools import lru_cache
+
 from django.db import models
 
+from habits.services import get_first_reminder_at, get_period
 from habits.validators import (validate_enjoyable_habit,
                                validate_periodicity_object,
                                validate_related_habit,
@@ -40,38 +43,78 @@ class Periodicity(models.Model):
         Returns:
             str: Описание периодичности с правильным склонением (например, "Каждые 2 дня")
         """
-        if self.value == 1:
-            if self.unit == "days":
-                return "Ежедневно"
-            elif self.unit == "week":
-                return "Еженедельно"
-            elif self.unit == "hours":
-                return "Ежечасно"
-            elif self.unit == "minutes":
-                return "Ежеминутно"
-
-        unit_parts = self.get_unit_display().split("/")
-        if self.value % 10 == 1 and self.value % 100 != 11:
-            unit = unit_parts[0]
-        elif 2 <= self.value % 10 <= 4 and (
-            self.value % 100 < 10 or self.value % 100 >= 20
-        ):
-            unit = unit_parts[1]
-        else:
-            unit = unit_parts[2]
-
-        return f"Каждые {self.value} {unit}"
+        return format_periodicity(self.value, self.unit)
 
     def clean(self):
         """Валидация модели"""
         validate_periodicity_object(self)
 
-    def save(self, *args, **kwargs):
-        """Сохранение с валидацией"""
-        self.full_clean()
+    def save(self, *args, skip_clean=False, **kwargs):
+        """
+        Сохранение с валидацией.
+
+        Args:
+            skip_clean (bool): Не вызывать full_clean (данные уже проверены сериализатором)
+        """
+        if not skip_clean:
+            self.full_clean()
         super().save(*args, **kwargs)
 
 
+@lru_cache(maxsize=1024)
+def format_periodicity(value, unit):
+    """
+    Возвращает описание периодичности с правильным склонением.
+
+    Различных пар (value, unit) немного, поэтому результат кешируется
+    на уровне процесса.
+
+    Args:
+        value (int): Значение периодичности
+        unit (str): Единица измерения из Periodicity.PERIOD_CHOICES
+
+    Returns:
+        str: Описание периодичности (например, "Каждые 2 дня")
+    """
+    if value == 1:
+        if unit == "days":
+            return "Ежедневно"
+        elif unit == "week":
+            return "Еженедельно"
+        elif unit == "hours":
+            return "Ежечасно"
+        elif unit == "minutes":
+            return "Ежеминутно"
+
+    unit_parts = dict(Periodicity.PERIOD_CHOICES).get(unit, unit).split("/")
+    if value % 10 == 1 and value % 100 != 11:
+        unit = unit_parts[0]
+    elif 2 <= value % 10 <= 4 and (value % 100 < 10 or value % 100 >= 20):
+        unit = unit_parts[1]
+    else:
+        unit = unit_parts[2]
+
+    return f"Каждые {value} {unit}"
+
+
+class HabitQuerySet(models.QuerySet):
+    """QuerySet привычек с выборками для планировщика напоминаний."""
+
+    def due(self, now):
+        """
+        Возвращает привычки, напоминание которых наступило к моменту now.
+
+        Выборка - один диапазонный запрос по индексированному next_reminder_at.
+
+        Args:
+            now (datetime): Текущий момент (включается)
+
+        Returns:
+            HabitQuerySet: Привычки с наступившим напоминанием
+        """
+        return self.filter(next_reminder_at__lte=now)
+
+
 class Habit(models.Model):
     """
     Модель привычки пользователя.
@@ -87,10 +130,14 @@ class Habit(models.Model):
         reward (CharField): Вознаграждение за выполнение
         time_to_complete (PositiveIntegerField): Время на выполнение (в секундах)
         publicity (BooleanField): Признак публичности привычки
+        next_reminder_at (DateTimeField): Момент следующего напоминания (вычисляется автоматически)
     """
 
     creator = models.ForeignKey(
-        User, on_delete=models.CASCADE, verbose_name="Создатель"
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Создатель",
     )
     place = models.CharField(max_length=100, verbose_name="Место выполнения привычки")
     habit_time = models.TimeField(verbose_name="Время выполнения привычки")
@@ -120,16 +167,58 @@ class Habit(models.Model):
         verbose_name="Время на выполнение (в секундах)",
     )
     publicity = models.BooleanField(default=False, verbose_name="Признак публичности")
+    next_reminder_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Следующее напоминание",
+    )
+
+    objects = HabitQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Привычка"
         verbose_name_plural = "Привычки"
         ordering = ["id"]
+        indexes = [
+            # Привычки пользователя: creator = ... ORDER BY id (заменяет индекс FK).
+            models.Index(fields=["creator", "id"], name="habit_creator_id_idx"),
+            # Лента публичных привычек: publicity ORDER BY id.
+            models.Index(
+                fields=["id"],
+                condition=models.Q(publicity=True),
+                name="habit_public_id_idx",
+            ),
+            # Наступившие напоминания: next_reminder_at <= ... ORDER BY next_reminder_at, id.
+            models.Index(
+                fields=["next_reminder_at", "id"], name="habit_next_reminder_idx"
+            ),
+        ]
 
     def __str__(self):
         """Строковое представление привычки."""
         return f"Я буду {self.action} в {self.habit_time} в {self.place}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные из БД параметры расписания и публичность."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_schedule = instance._get_schedule()
+        instance._loaded_publicity = instance.__dict__.get("publicity", False)
+        return instance
+
+    def _get_schedule(self):
+        """Возвращает поля, от которых зависит расписание напоминаний."""
+        return self.__dict__.get("habit_time"), self.__dict__.get("periodicity_id")
+
+    def schedule_changed(self):
+        """Проверяет, изменилось ли расписание с момента загрузки из БД."""
+        return getattr(self, "_loaded_schedule", None) != self._get_schedule()
+
+    def publicity_involved(self):
+        """Проверяет, публична ли привычка сейчас или была публичной при загрузке из БД."""
+        return self.publicity or getattr(self, "_loaded_publicity", False)
+
     def clean(self):
         """
         Валидация модели перед сохранением.
@@ -147,9 +236,63 @@ class Habit(models.Model):
             validate_related_habit(self.related_habit)
         validate_enjoyable_habit(self.enjoyable_habit, self.reward, self.related_habit)
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, skip_clean=False, **kwargs):
         """
         Переопределение метода сохранения с предварительной валидацией.
+
+        При создании привычки или изменении ее времени/периодичности
+        пересчитывает момент следующего напоминания в часовом поясе создателя.
+
+        Args:
+            skip_clean (bool): Не вызывать full_clean (данные уже проверены сериализатором)
         """
-        self.full_clean()
+        if not skip_clean:
+            self.full_clean()
+        if self.next_reminder_at is None or self.schedule_changed():
+            self.next_reminder_at = get_first_reminder_at(
+                self.habit_time,
+                get_period(self.periodicity),
+                tz=self.creator.get_timezone(),
+            )
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "next_reminder_at"}
         super().save(*args, **kwargs)
+        self._loaded_schedule = self._get_schedule()
+        self._loaded_publicity = self.publicity
+
+
+class ReminderDelivery(models.Model):
+    """
+    Запись об отправке напоминания о конкретном наступлении привычки.
+
+    Уникальность пары (привычка, наступление) защищает от повторной отправки
+    при перезапусках и параллельной работе планировщика.
+
+    Attributes:
+        habit (ForeignKey): Привычка (связь с Habit)
+        occurrence (DateTimeField): Момент наступления, о котором отправлено напоминание
+        created_at (DateTimeField): Время обработки наступления
+    """
+
+    habit = models.ForeignKey(
+        Habit,
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+        verbose_name="Привычка",
+    )
+    occurrence = models.DateTimeField(verbose_name="Наступление")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Обработано")
+
+    class Meta:
+        verbose_name = "Отправка напоминания"
+        verbose_name_plural = "Отправки напоминаний"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["habit", "occurrence"], name="unique_habit_occurrence"
+            )
+        ]
+
+    def __str__(self):
+        """Строковое представление отправки."""
+        return f"{self.habit_id}: {self.occurrence}"
@@ -1,16 +1,82 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class CustomCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация по id.
+
+    Страница выбирается условием по id вместо OFFSET, поэтому стоимость запроса
+    не растет с глубиной листания. Курсоры непрозрачны для клиента.
+
+    Attributes:
+        page_size (int): Количество элементов на странице по умолчанию
+        page_size_query_param (str): Параметр запроса для изменения размера страницы
+        max_page_size (int): Максимально допустимый размер страницы
+        ordering (str): Поле, по которому строится курсор (совпадает с Habit.Meta.ordering)
+        count_query_param (str): Параметр запроса, значение "false" отключает подсчет count
+    """
+
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 10
+    ordering = "id"
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Возвращает страницу и, если не отключено, общее количество элементов."""
+        self.count = None
+        if request.query_params.get(self.count_query_param) != "false":
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Формирует ответ в формате постраничной пагинации (count - если подсчитан)."""
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
 
 
 class CustomPagination(PageNumberPagination):
     """
     Кастомная пагинация для API.
 
+    По умолчанию постраничная. Запрос с параметром pagination=cursor или cursor=...
+    переключает ее в курсорный режим (CustomCursorPagination).
+
     Attributes:
         page_size (int): Количество элементов на странице по умолчанию
         page_size_query_param (str): Параметр запроса для изменения размера страницы
         max_page_size (int): Максимально допустимый размер страницы
+        mode_query_param (str): Параметр запроса для выбора режима пагинации
+        cursor_class (type): Класс курсорной пагинации
     """
 
     page_size = 5
     page_size_query_param = "page_size"
     max_page_size = 10
+    mode_query_param = "pagination"
+    cursor_class = CustomCursorPagination
+
+    def get_cursor_paginator(self, request):
+        """Возвращает курсорный пагинатор, если запрошен курсорный режим."""
+        cursor_class = self.cursor_class
+        if (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or cursor_class.cursor_query_param in request.query_params
+        ):
+            return cursor_class()
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Возвращает страницу в выбранном режиме пагинации."""
+        self.cursor_paginator = self.get_cursor_paginator(request)
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Формирует ответ в выбранном режиме пагинации."""
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
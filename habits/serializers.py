@@ -1,37 +1,122 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
 
-from habits.models import Habit, Periodicity
-from habits.validators import (validate_enjoyable_habit,
+from habits.cache import bump_public_habits_version, get_periodicity_table
+from habits.constans import ERROR_MESSAGES
+from habits.models import Habit, Periodicity, format_periodicity
+from habits.services import get_first_reminder_at, get_period
+from habits.validators import (validate_enjoyable_habit, validate_habits,
                                validate_periodicity_data,
                                validate_related_habit,
                                validate_reward_and_related,
                                validate_time_limit)
 
 
-class HabitSerializer(serializers.ModelSerializer):
+class ValidatedSaveMixin:
+    """
+    Примесь для сериализаторов моделей, проверяющих все правила модели в validate.
+
+    Сохраняет объекты через save(skip_clean=True), чтобы модель не повторяла
+    проверку (и запросы full_clean) уже проверенных сериализатором данных.
+    """
+
+    def _get_final_value(self, data, field, default=None):
+        """
+        Возвращает итоговое значение поля после сохранения.
+
+        Args:
+            data (dict): Проверяемые данные
+            field (str): Имя поля
+            default: Значение по умолчанию при создании объекта
+
+        Returns:
+            Значение из данных запроса, а если его нет - из обновляемого объекта
+        """
+        if field in data:
+            return data[field]
+        if self.instance is not None:
+            return getattr(self.instance, field)
+        return default
+
+    def create(self, validated_data):
+        """Создает объект без повторной валидации моделью."""
+        instance = self.Meta.model(**validated_data)
+        instance.save(skip_clean=True)
+        return instance
+
+    def update(self, instance, validated_data):
+        """Обновляет объект без повторной валидации моделью."""
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(skip_clean=True)
+        return instance
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Поле связи по первичному ключу, разрешаемое по заранее загруженным объектам.
+
+    Если в контексте есть context["prefetched"][модель], объект берется оттуда
+    и проверка связи не выполняет отдельный запрос к БД для каждого элемента.
+    Иначе поле работает как обычный PrimaryKeyRelatedField.
+    """
+
+    def to_internal_value(self, data):
+        """
+        Возвращает объект по первичному ключу.
+
+        Args:
+            data: Первичный ключ
+
+        Returns:
+            Model: Связанный объект
+
+        Raises:
+            ValidationError: Если ключ некорректен или объект не найден
+        """
+        prefetched = self.context.get("prefetched", {}).get(self.queryset.model)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return prefetched[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class HabitSerializer(ValidatedSaveMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Habit.
 
+    Связанная привычка и периодичность разрешаются по context["prefetched"],
+    если он передан (см. PrefetchedPrimaryKeyRelatedField). Периодичность
+    для periodicity_display берется из select_related или из таблицы
+    периодичностей процесса, без запроса на каждую привычку.
+
     Attributes:
+        related_habit (PrefetchedPrimaryKeyRelatedField): Связанная привычка
         creator (HiddenField): Автоматически устанавливает текущего пользователя как создателя
-        periodicity_display (CharField): Строковое представление периодичности (только для чтения)
+        periodicity (PrefetchedPrimaryKeyRelatedField): Периодичность выполнения
+        periodicity_display (SerializerMethodField): Строковое представление периодичности
     """
 
-    related_habit = serializers.PrimaryKeyRelatedField(
+    related_habit = PrefetchedPrimaryKeyRelatedField(
         queryset=Habit.objects.all(), allow_null=True, required=False
     )
     creator = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    periodicity = serializers.PrimaryKeyRelatedField(
+    periodicity = PrefetchedPrimaryKeyRelatedField(
         queryset=Periodicity.objects.all(), allow_null=True, required=False
     )
-    periodicity_display = serializers.CharField(
-        source="periodicity.__str__", read_only=True
-    )
+    periodicity_display = serializers.SerializerMethodField()
 
     class Meta:
         model = Habit
-        fields = "__all__"
+        exclude = ["next_reminder_at"]
 
     def validate(self, data):
         """
@@ -46,10 +131,10 @@ class HabitSerializer(serializers.ModelSerializer):
         Raises:
             ValidationError: Если данные не проходят валидацию
         """
-        reward = data.get("reward")
-        related_habit = data.get("related_habit")
-        enjoyable = data.get("enjoyable_habit")
-        time_to_complete = data.get("time_to_complete", 0)
+        reward = self._get_final_value(data, "reward")
+        related_habit = self._get_final_value(data, "related_habit")
+        enjoyable = self._get_final_value(data, "enjoyable_habit")
+        time_to_complete = self._get_final_value(data, "time_to_complete", 0)
 
         validate_reward_and_related(reward, related_habit)
         validate_time_limit(time_to_complete)
@@ -61,8 +146,358 @@ class HabitSerializer(serializers.ModelSerializer):
 
         return data
 
+    @staticmethod
+    def get_periodicity_display(obj):
+        """
+        Возвращает строковое представление периодичности привычки.
+
+        Args:
+            obj (Habit): Привычка
+
+        Returns:
+            str: Описание периодичности или None, если она не задана
+        """
+        if Habit.periodicity.is_cached(obj):
+            periodicity = obj.periodicity
+        else:
+            periodicity = get_periodicity_table().get(obj.periodicity_id)
+        return str(periodicity) if periodicity is not None else None
+
+
+class HabitBulkItemSerializer(HabitSerializer):
+    """
+    Сериализатор одной привычки в пакетном запросе.
+
+    Связанная привычка и периодичность разрешаются по объектам, загруженным
+    HabitBulkSerializer одним запросом на модель (context["prefetched"]).
+    """
+
+    def validate(self, data):
+        """Правила модели проверяются для всего пакета сразу (validate_habits)."""
+        return data
+
+
+class HabitBulkSerializer(serializers.Serializer):
+    """
+    Сериализатор пакетного создания, обновления и удаления привычек.
+
+    Все элементы проверяются за один проход. Связанные привычки, обновляемые и
+    удаляемые привычки загружаются одним запросом, периодичности - еще одним.
+    Ошибки возвращаются по каждому элементу списками той же длины, что и
+    разделы запроса, изменения сохраняются только если все элементы корректны.
+
+    Attributes:
+        create (ListField): Данные новых привычек
+        update (ListField): Частичные данные обновляемых привычек (с ключом id)
+        delete (ListField): Идентификаторы удаляемых привычек
+    """
+
+    # Элементы проверяются в validate, а не дочерними полями: ошибки дочернего
+    # поля ListField возвращаются словарем по индексам, а не списком.
+    create = serializers.ListField(required=False, default=list)
+    update = serializers.ListField(required=False, default=list)
+    delete = serializers.ListField(required=False, default=list)
+
+    @staticmethod
+    def _get_pk(value):
+        """Возвращает целочисленный первичный ключ или None, если он некорректен."""
+        if isinstance(value, bool):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _prefetch(self, data):
+        """
+        Загружает все упомянутые в запросе привычки и периодичности.
+
+        Args:
+            data (dict): Данные запроса с ключами create, update, delete
+
+        Returns:
+            dict: Объекты по моделям и первичным ключам
+        """
+        updates = [item for item in data["update"] if isinstance(item, dict)]
+        items = [item for item in data["create"] if isinstance(item, dict)] + updates
+        habit_ids = {self._get_pk(item.get("related_habit")) for item in items}
+        habit_ids.update(self._get_pk(item.get("id")) for item in updates)
+        habit_ids.update(self._get_pk(pk) for pk in data["delete"])
+        # related_habit обновляемых привычек нужна для проверки правил модели.
+        habits = Habit.objects.select_related("related_habit").in_bulk(
+            habit_ids - {None}
+        )
+
+        periodicity_ids = {self._get_pk(item.get("periodicity")) for item in items}
+        periodicity_ids.add(Habit._meta.get_field("periodicity").get_default())
+        periodicity_ids.update(habit.periodicity_id for habit in habits.values())
+        periodicities = Periodicity.objects.in_bulk(periodicity_ids - {None})
+        return {Habit: habits, Periodicity: periodicities}
+
+    @staticmethod
+    def _add_rule_errors(habits, positions, errors):
+        """
+        Проверяет правила модели для всех привычек пакета за один проход.
+
+        Args:
+            habits (list[Habit]): Привычки, прошедшие проверку полей
+            positions (list[int]): Индексы привычек в исходном списке элементов
+            errors (list): Ошибки по элементам, дополняются на месте
+        """
+        for index, messages in validate_habits(habits).items():
+            errors[positions[index]] = {"non_field_errors": messages}
+
+    def _validate_create(self, items, context):
+        """
+        Проверяет данные новых привычек.
+
+        Returns:
+            tuple: Новые привычки и ошибки по каждому элементу
+        """
+        created = []
+        positions = []
+        errors = []
+        for item in items:
+            if not isinstance(item, dict):
+                errors.append({"non_field_errors": [ERROR_MESSAGES[12]]})
+                continue
+            serializer = HabitBulkItemSerializer(data=item, context=context)
+            if serializer.is_valid():
+                created.append(Habit(**serializer.validated_data))
+                positions.append(len(errors))
+                errors.append({})
+            else:
+                errors.append(serializer.errors)
+        self._add_rule_errors(created, positions, errors)
+        return created, errors
+
+    def _validate_update(self, items, context, seen):
+        """
+        Проверяет данные обновляемых привычек и применяет их к объектам.
+
+        Returns:
+            tuple: Обновленные привычки, обновляемые поля и ошибки по каждому элементу
+        """
+        habits = context["prefetched"][Habit]
+        user = context["request"].user
+        updated = []
+        positions = []
+        update_fields = set()
+        errors = []
+        for item in items:
+            if not isinstance(item, dict):
+                errors.append({"non_field_errors": [ERROR_MESSAGES[12]]})
+                continue
+            pk = self._get_pk(item.get("id"))
+            habit = habits.get(pk)
+            if habit is None or habit.creator_id != user.pk:
+                errors.append({"id": [ERROR_MESSAGES[6]]})
+                continue
+            if pk in seen:
+                errors.append({"id": [ERROR_MESSAGES[7]]})
+                continue
+            seen.add(pk)
+            serializer = HabitBulkItemSerializer(
+                habit, data=item, partial=True, context=context
+            )
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            for field, value in serializer.validated_data.items():
+                setattr(habit, field, value)
+            update_fields.update(serializer.validated_data)
+            updated.append(habit)
+            positions.append(len(errors))
+            errors.append({})
+        self._add_rule_errors(updated, positions, errors)
+        return updated, update_fields, errors
+
+    def _validate_delete(self, ids, context, seen):
+        """
+        Проверяет идентификаторы удаляемых привычек.
+
+        Returns:
+            tuple: Удаляемые привычки и ошибки по каждому элементу
+        """
+        habits = context["prefetched"][Habit]
+        user = context["request"].user
+        deleted = []
+        errors = []
+        for value in ids:
+            pk = self._get_pk(value)
+            if pk is None:
+                errors.append([ERROR_MESSAGES[12]])
+                continue
+            habit = habits.get(pk)
+            if habit is None or habit.creator_id != user.pk:
+                errors.append([ERROR_MESSAGES[6]])
+            elif pk in seen:
+                errors.append([ERROR_MESSAGES[7]])
+            else:
+                deleted.append(habit)
+                errors.append([])
+            seen.add(pk)
+        return deleted, errors
+
+    @staticmethod
+    def _schedule(habit, periodicities, tz):
+        """
+        Пересчитывает следующее напоминание, как Habit.save, без запросов к БД.
+
+        Returns:
+            bool: Признак того, что напоминание было пересчитано
+        """
+        if not Habit.periodicity.is_cached(habit):
+            habit.periodicity = periodicities.get(habit.periodicity_id)
+        if habit.next_reminder_at is not None and not habit.schedule_changed():
+            return False
+        habit.next_reminder_at = get_first_reminder_at(
+            habit.habit_time, get_period(habit.periodicity), tz=tz
+        )
+        return True
+
+    def validate(self, data):
+        """
+        Проверяет все элементы запроса и готовит объекты для сохранения.
+
+        Args:
+            data (dict): Данные запроса
+
+        Returns:
+            dict: Новые привычки (create), обновленные привычки (update),
+                обновляемые поля (update_fields) и удаляемые привычки (delete)
+
+        Raises:
+            ValidationError: Если хотя бы один элемент некорректен
+        """
+        max_items = settings.HABITS_BULK_MAX_ITEMS
+        if len(data["create"]) + len(data["update"]) + len(data["delete"]) > max_items:
+            raise serializers.ValidationError(ERROR_MESSAGES[8].format(max_items))
+
+        context = {**self.context, "prefetched": self._prefetch(data)}
+        seen = set()
+        created, create_errors = self._validate_create(data["create"], context)
+        updated, update_fields, update_errors = self._validate_update(
+            data["update"], context, seen
+        )
+        deleted, delete_errors = self._validate_delete(data["delete"], context, seen)
+        errors = {
+            key: item_errors
+            for key, item_errors in (
+                ("create", create_errors),
+                ("update", update_errors),
+                ("delete", delete_errors),
+            )
+            if any(item_errors)
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        periodicities = context["prefetched"][Periodicity]
+        tz = self.context["request"].user.get_timezone()
+        for habit in created:
+            self._schedule(habit, periodicities, tz)
+        for habit in updated:
+            if self._schedule(habit, periodicities, tz):
+                update_fields.add("next_reminder_at")
+        return {
+            "create": created,
+            "update": updated,
+            "update_fields": update_fields,
+            "delete": deleted,
+        }
+
+    def save(self, **kwargs):
+        """
+        Сохраняет все изменения в одной транзакции.
+
+        Returns:
+            dict: Созданные (created), обновленные (updated) привычки
+                и идентификаторы удаленных (deleted)
+        """
+        data = self.validated_data
+        deleted = [habit.pk for habit in data["delete"]]
+        with transaction.atomic():
+            created = Habit.objects.bulk_create(data["create"])
+            if data["update"] and data["update_fields"]:
+                Habit.objects.bulk_update(data["update"], data["update_fields"])
+            if deleted:
+                Habit.objects.filter(pk__in=deleted).delete()
+        # bulk_create/bulk_update не отправляют сигналы, кеш ленты сбрасывается явно.
+        if any(habit.publicity_involved() for habit in created + data["update"]):
+            bump_public_habits_version()
+        self.instance = {
+            "created": created,
+            "updated": data["update"],
+            "deleted": deleted,
+        }
+        return self.instance
+
+
+HABIT_VALUES_FIELDS = (
+    "id",
+    "related_habit_id",
+    "periodicity_id",
+    "periodicity__value",
+    "periodicity__unit",
+    "place",
+    "habit_time",
+    "action",
+    "enjoyable_habit",
+    "reward",
+    "time_to_complete",
+    "publicity",
+)
+
+
+def serialize_habit_row(row):
+    """
+    Быстрое представление одной привычки по строке .values(*HABIT_VALUES_FIELDS).
+
+    Формат совпадает с HabitSerializer.
+
+    Args:
+        row (dict): Строка привычки с полями HABIT_VALUES_FIELDS
+
+    Returns:
+        dict: Представление привычки
+    """
+    return {
+        "id": row["id"],
+        "related_habit": row["related_habit_id"],
+        "periodicity": row["periodicity_id"],
+        "periodicity_display": (
+            format_periodicity(row["periodicity__value"], row["periodicity__unit"])
+            if row["periodicity_id"] is not None
+            else None
+        ),
+        "place": row["place"],
+        "habit_time": row["habit_time"].isoformat(),
+        "action": row["action"],
+        "enjoyable_habit": row["enjoyable_habit"],
+        "reward": row["reward"],
+        "time_to_complete": row["time_to_complete"],
+        "publicity": row["publicity"],
+    }
+
+
+def serialize_habit_values(rows):
+    """
+    Быстрое представление привычек для чтения списков.
+
+    Строит словари напрямую из строк .values(*HABIT_VALUES_FIELDS), минуя
+    поля DRF. Формат ответа совпадает с HabitSerializer.
+
+    Args:
+        rows (Iterable[dict]): Строки привычек с полями HABIT_VALUES_FIELDS
+
+    Returns:
+        list[dict]: Представления привычек
+    """
+    return [serialize_habit_row(row) for row in rows]
+
 
-class PeriodicitySerializer(serializers.ModelSerializer):
+class PeriodicitySerializer(ValidatedSaveMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Periodicity.
 
@@ -78,7 +513,9 @@ class PeriodicitySerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """Валидация данных в сериализаторе"""
-        validate_periodicity_data(data)
+        validate_periodicity_data(
+            {field: self._get_final_value(data, field) for field in ("value", "unit")}
+        )
         return data
 
     @staticmethod
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+PERIOD_UNITS = {
+    "minutes": "minutes",
+    "hours": "hours",
+    "days": "days",
+    "week": "weeks",
+}
+
+DAY = timedelta(days=1)
+
+
+def get_period(periodicity):
+    """
+    Возвращает длительность одного периода привычки.
+
+    Args:
+        periodicity (Periodicity): Периодичность привычки (None - ежедневно)
+
+    Returns:
+        timedelta: Интервал между напоминаниями
+    """
+    if periodicity is None:
+        return DAY
+    return get_unit_period(periodicity.value, periodicity.unit)
+
+
+def get_unit_period(value, unit):
+    """
+    Возвращает длительность периода по значению и единице измерения.
+
+    Args:
+        value (int): Значение периодичности (None - ежедневно)
+        unit (str): Единица измерения из Periodicity.PERIOD_CHOICES
+
+    Returns:
+        timedelta: Интервал между напоминаниями
+    """
+    if value is None:
+        return DAY
+    # Нулевое значение допускается полем модели, но не имеет смысла как период.
+    return timedelta(**{PERIOD_UNITS[unit]: max(value, 1)})
+
+
+def get_periods_until(start, period, moment):
+    """
+    Возвращает число целых периодов от start до ближайшего наступления после moment.
+
+    Args:
+        start (datetime): Начало серии напоминаний
+        period (timedelta): Длительность периода
+        moment (datetime): Момент, после которого ищется наступление
+
+    Returns:
+        int: Наименьшее k, при котором start + k * period > moment (может быть отрицательным)
+    """
+    return (moment - start) // period + 1
+
+
+def get_first_reminder_at(habit_time, period=DAY, after=None, tz=None):
+    """
+    Вычисляет ближайший момент напоминания о привычке.
+
+    Серия напоминаний привязана к habit_time текущих суток в часовом поясе tz.
+    Для периодов короче суток (минуты, часы) напоминания идут непрерывно с шагом
+    period через habit_time, для суточных и более длинных - первое напоминание
+    приходится на ближайшее habit_time по местным часам.
+
+    Args:
+        habit_time (time): Местное время выполнения привычки
+        period (timedelta): Длительность периода привычки
+        after (datetime): Момент, после которого ищется напоминание (по умолчанию - сейчас)
+        tz (tzinfo): Часовой пояс пользователя (по умолчанию - текущий)
+
+    Returns:
+        datetime: Ближайшее напоминание строго после after
+    """
+    after = after or timezone.now()
+    tz = tz or timezone.get_current_timezone()
+    local_date = timezone.localtime(after, tz).date()
+    anchor = timezone.make_aware(datetime.combine(local_date, habit_time), tz)
+    if period < DAY:
+        return anchor + get_periods_until(anchor, period, after) * period
+    if anchor <= after:
+        anchor = timezone.make_aware(datetime.combine(local_date + DAY, habit_time), tz)
+    return anchor
+
+
+def get_next_reminder_at(reminder_at, period, after=None, tz=None):
+    """
+    Сдвигает момент напоминания на целое число периодов вперед.
+
+    Периоды от суток и длиннее отсчитываются по местным часам часового пояса tz,
+    поэтому напоминание остается в habit_time при переходе на летнее время.
+
+    Args:
+        reminder_at (datetime): Текущий (уже наступивший) момент напоминания
+        period (timedelta): Длительность периода привычки
+        after (datetime): Момент, после которого должно быть следующее напоминание
+        tz (tzinfo): Часовой пояс пользователя (по умолчанию - текущий)
+
+    Returns:
+        datetime: Первое напоминание строго после after
+    """
+    after = after or timezone.now()
+    if reminder_at > after:
+        return reminder_at
+    if period < DAY:
+        return reminder_at + get_periods_until(reminder_at, period, after) * period
+
+    tz = tz or timezone.get_current_timezone()
+    local_reminder_at = timezone.make_naive(reminder_at, tz)
+    local_after = timezone.make_naive(after, tz)
+    periods = get_periods_until(local_reminder_at, period, local_after)
+    next_reminder_at = timezone.make_aware(local_reminder_at + periods * period, tz)
+    if next_reminder_at <= after:
+        # Сдвиг часов мог "съесть" разницу между местным и абсолютным временем.
+        next_reminder_at = timezone.make_aware(
+            local_reminder_at + (periods + 1) * period, tz
+        )
+    return next_reminder_at
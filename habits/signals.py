@@ -0,0 +1,71 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from habits.cache import bump_periodicity_version, bump_public_habits_version
+from habits.models import Habit, Periodicity
+from habits.services import get_first_reminder_at, get_unit_period
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+def reschedule_user_habits(sender, instance, created, **kwargs):
+    """
+    Пересчитывает напоминания привычек пользователя при смене часового пояса.
+
+    Args:
+        sender (type): Модель User
+        instance (User): Сохраненный пользователь
+        created (bool): Признак создания нового пользователя
+    """
+    if created or not instance.timezone_changed():
+        return
+
+    tz = instance.get_timezone()
+    habits = [
+        Habit(
+            id=habit["id"],
+            next_reminder_at=get_first_reminder_at(
+                habit["habit_time"],
+                get_unit_period(
+                    habit["periodicity__value"], habit["periodicity__unit"]
+                ),
+                tz=tz,
+            ),
+        )
+        for habit in Habit.objects.filter(creator=instance).values(
+            "id", "habit_time", "periodicity__value", "periodicity__unit"
+        )
+    ]
+    Habit.objects.bulk_update(habits, ["next_reminder_at"], batch_size=1000)
+
+
+@receiver(post_save, sender=Habit)
+@receiver(post_delete, sender=Habit)
+def invalidate_public_habits_on_habit(sender, instance, **kwargs):
+    """
+    Сбрасывает кеш ленты публичных привычек при изменении публичной привычки.
+
+    Срабатывает, если привычка публична сейчас или была публичной до изменения.
+
+    Args:
+        sender (type): Модель Habit
+        instance (Habit): Сохраненная или удаленная привычка
+    """
+    if instance.publicity_involved():
+        bump_public_habits_version()
+
+
+@receiver(post_save, sender=Periodicity)
+@receiver(post_delete, sender=Periodicity)
+def invalidate_periodicity_caches(sender, instance, **kwargs):
+    """
+    Сбрасывает таблицу периодичностей и кеш ленты публичных привычек.
+
+    Лента содержит текстовое описание периодичности каждой привычки.
+
+    Args:
+        sender (type): Модель Periodicity
+        instance (Periodicity): Сохраненная или удаленная периодичность
+    """
+    bump_periodicity_version()
+    bump_public_habits_version()
@@ -1,13 +1,30 @@
-from unittest.mock import Mock
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+from zoneinfo import ZoneInfo
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from rest_framework import status
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers, status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
+from habits.cache import get_periodicity_table
 from habits.constans import ERROR_MESSAGES
-from habits.models import Habit, Periodicity
-from habits.validators import validate_periodicity_object
+from habits.models import Habit, Periodicity, format_periodicity
+from habits.serializers import (HABIT_VALUES_FIELDS, HabitSerializer,
+                                PeriodicitySerializer, serialize_habit_values)
+from habits.services import (DAY, get_first_reminder_at, get_next_reminder_at,
+                             get_period)
+from habits.validators import validate_habits, validate_periodicity_object
 from habits.views import (HabitDeleteApiView, HabitListApiView,
                           HabitRetrieveApiView, HabitUpdateApiView)
 from users.models import User
@@ -345,3 +362,669 @@ class PeriodicityTestCase(APITestCase):
         for value, unit, expected_str in test_cases:
             periodicity = Periodicity(value=value, unit=unit)
             self.assertEqual(str(periodicity), expected_str)
+
+
+class HabitScheduleTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.habit = Habit.objects.create(
+            creator=self.user,
+            action="Тестовое действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            time_to_complete=60,
+        )
+
+    def test_get_first_reminder_at(self):
+        """Тест вычисления ближайшего напоминания до и после времени привычки."""
+        before = timezone.make_aware(datetime(2025, 1, 1, 7, 0))
+        after = timezone.make_aware(datetime(2025, 1, 1, 9, 0))
+        self.assertEqual(
+            get_first_reminder_at(time(8, 0), after=before),
+            timezone.make_aware(datetime(2025, 1, 1, 8, 0)),
+        )
+        self.assertEqual(
+            get_first_reminder_at(time(8, 0), after=after),
+            timezone.make_aware(datetime(2025, 1, 2, 8, 0)),
+        )
+
+    def test_get_first_reminder_at_short_period(self):
+        """Тест непрерывной серии напоминаний для периодов короче суток."""
+        after = timezone.make_aware(datetime(2025, 1, 1, 9, 50))
+        self.assertEqual(
+            get_first_reminder_at(time(8, 0), timedelta(minutes=15), after),
+            timezone.make_aware(datetime(2025, 1, 1, 10, 0)),
+        )
+        self.assertEqual(
+            get_first_reminder_at(time(8, 0), timedelta(hours=5), after),
+            timezone.make_aware(datetime(2025, 1, 1, 13, 0)),
+        )
+        self.assertEqual(
+            get_first_reminder_at(time(8, 0), timedelta(days=3), after),
+            timezone.make_aware(datetime(2025, 1, 2, 8, 0)),
+        )
+
+    def test_due(self):
+        """Тест выборки привычек с наступившим напоминанием."""
+        reminder_at = self.habit.next_reminder_at
+        self.assertIn(self.habit, Habit.objects.due(reminder_at))
+        self.assertNotIn(self.habit, Habit.objects.due(reminder_at - DAY))
+
+    def test_get_next_reminder_at(self):
+        """Тест сдвига напоминания на целое число периодов."""
+        reminder_at = timezone.make_aware(datetime(2025, 1, 1, 8, 0))
+        period = get_period(Periodicity(value=15, unit="minutes"))
+        self.assertEqual(
+            get_next_reminder_at(
+                reminder_at, period, reminder_at + timedelta(minutes=40)
+            ),
+            reminder_at + timedelta(minutes=45),
+        )
+        self.assertEqual(get_period(None), timedelta(days=1))
+
+    def test_save_sets_next_reminder_at(self):
+        """Тест пересчета напоминания только при изменении расписания."""
+        self.assertIsNotNone(self.habit.next_reminder_at)
+        self.assertEqual(
+            timezone.localtime(self.habit.next_reminder_at).time(), time(8, 0)
+        )
+
+        reminder_at = self.habit.next_reminder_at
+        self.habit.place = "Другое место"
+        self.habit.save()
+        self.assertEqual(self.habit.next_reminder_at, reminder_at)
+
+        self.habit.habit_time = "09:30:00"
+        self.habit.save()
+        self.habit.refresh_from_db()
+        self.assertEqual(
+            timezone.localtime(self.habit.next_reminder_at).time(), time(9, 30)
+        )
+
+    def test_user_timezone(self):
+        """Тест вычисления напоминаний в часовом поясе пользователя."""
+        new_york = ZoneInfo("America/New_York")
+        after = datetime(2025, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            get_first_reminder_at(time(8, 0), after=after, tz=new_york),
+            datetime(2025, 1, 1, 13, 0, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(
+            get_first_reminder_at(
+                time(23, 30), after=datetime(2025, 1, 1, 20, 0, tzinfo=dt_timezone.utc)
+            ),
+            datetime(2025, 1, 1, 20, 30, tzinfo=dt_timezone.utc),
+        )
+
+    def test_next_reminder_at_dst(self):
+        """Тест сохранения местного времени напоминания при переходе на летнее время."""
+        new_york = ZoneInfo("America/New_York")
+        reminder_at = datetime(2025, 3, 8, 8, 0, tzinfo=new_york)
+        self.assertEqual(
+            get_next_reminder_at(reminder_at, DAY, reminder_at, new_york),
+            datetime(2025, 3, 9, 8, 0, tzinfo=new_york),
+        )
+        self.assertEqual(
+            get_next_reminder_at(reminder_at, timedelta(hours=1), reminder_at),
+            reminder_at + timedelta(hours=1),
+        )
+
+    def test_reschedule_on_timezone_change(self):
+        """Тест пересчета напоминаний при смене часового пояса пользователя."""
+        self.user.timezone = "Asia/Vladivostok"
+        self.user.save()
+
+        self.habit.refresh_from_db()
+        local_reminder_at = timezone.localtime(
+            self.habit.next_reminder_at, ZoneInfo("Asia/Vladivostok")
+        )
+        self.assertEqual(local_reminder_at.time(), time(8, 0))
+
+
+class HabitPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.habits = [
+            Habit.objects.create(
+                creator=self.user,
+                action=f"Действие {i}",
+                place="Тестовое место",
+                habit_time="08:00:00",
+                time_to_complete=60,
+                publicity=True,
+            )
+            for i in range(7)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def test_cursor_pagination(self):
+        """Тест курсорной пагинации публичных привычек."""
+        url = reverse("habits:habits_public_list")
+        response = self.client.get(url, {"pagination": "cursor", "page_size": 3})
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(data["count"], 7)
+        self.assertIsNone(data["previous"])
+        self.assertEqual(
+            [habit["id"] for habit in data["results"]],
+            [habit.pk for habit in self.habits[:3]],
+        )
+        self.assertIn("cursor=", data["next"])
+
+        ids = [habit["id"] for habit in data["results"]]
+        while data["next"]:
+            data = self.client.get(data["next"]).json()
+            ids += [habit["id"] for habit in data["results"]]
+        self.assertEqual(ids, [habit.pk for habit in self.habits])
+
+    def test_cursor_pagination_without_count(self):
+        """Тест отключения подсчета count в курсорном режиме."""
+        url = reverse("habits:habits_list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"pagination": "cursor", "count": "false"})
+        data = response.json()
+        self.assertNotIn("count", data)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries))
+        self.assertEqual(len(data["results"]), 5)
+
+    def test_invalid_cursor(self):
+        """Тест запроса с некорректным курсором."""
+        url = reverse("habits:habits_public_list")
+        response = self.client.get(url, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination(self):
+        """Тест постраничной пагинации по умолчанию."""
+        url = reverse("habits:habits_public_list")
+        response = self.client.get(url, {"page": 2})
+        data = response.json()
+        self.assertEqual(data["count"], 7)
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_list_query_count(self):
+        """Тест постоянного числа запросов на страницу списка независимо от ее размера."""
+        periodicity = Periodicity.objects.create(value=2, unit="days")
+        Habit.objects.filter(creator=self.user).update(periodicity=periodicity)
+        for url in (
+            reverse("habits:habits_list"),
+            reverse("habits:habits_public_list"),
+        ):
+            for page_size in (1, 10):
+                for params in ({}, {"pagination": "cursor"}):
+                    cache.clear()
+                    with self.assertNumQueries(2):
+                        response = self.client.get(
+                            url, {"page_size": page_size, **params}
+                        )
+                    results = response.json()["results"]
+                    self.assertEqual(len(results), min(page_size, 7))
+                    self.assertEqual(results[0]["periodicity_display"], "Каждые 2 дня")
+
+
+class HabitPublicCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.habit = Habit.objects.create(
+            creator=self.user,
+            action="Публичное действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            time_to_complete=60,
+            publicity=True,
+        )
+        self.private_habit = Habit.objects.create(
+            creator=self.user,
+            action="Личное действие",
+            place="Тестовое место",
+            habit_time="09:00:00",
+            time_to_complete=60,
+        )
+        self.url = reverse("habits:habits_public_list")
+        self.client.force_authenticate(user=self.user)
+
+    def test_public_list_cached(self):
+        """Тест повторного запроса ленты публичных привычек без обращения к БД."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["count"], 1)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(self.url)
+        self.assertEqual(cached_response.json(), response.json())
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {"page_size": 1})
+
+    def test_public_list_not_modified(self):
+        """Тест ответа 304 на условный запрос с актуальным ETag."""
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.habit.action = "Новое действие"
+        self.habit.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["results"][0]["action"], "Новое действие")
+
+    @override_settings(PUBLIC_HABITS_CACHE_TIMEOUT=0)
+    def test_public_list_etag_follows_content(self):
+        """Тест смены ETag при изменении ленты без сброса версии кеша."""
+        etag = self.client.get(self.url)["ETag"]
+        Habit.objects.filter(pk=self.habit.pk).update(action="Новое действие")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_public_list_invalidation(self):
+        """Тест сброса кеша только при изменениях, затрагивающих публичные привычки."""
+        etag = self.client.get(self.url)["ETag"]
+        self.private_habit.action = "Другое личное действие"
+        self.private_habit.save()
+        self.assertEqual(self.client.get(self.url)["ETag"], etag)
+
+        self.private_habit.publicity = True
+        self.private_habit.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["count"], 2)
+
+        private_habit = Habit.objects.get(pk=self.private_habit.pk)
+        private_habit.publicity = False
+        private_habit.save()
+        self.assertEqual(self.client.get(self.url).json()["count"], 1)
+
+        self.habit.delete()
+        self.assertEqual(self.client.get(self.url).json()["count"], 0)
+
+
+class HabitBulkTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.other_user = User.objects.create(email="other@mail.com")
+        self.periodicity = Periodicity.objects.create(value=2, unit="days")
+        self.enjoyable_habit = Habit.objects.create(
+            creator=self.user,
+            action="Приятное действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            time_to_complete=60,
+            enjoyable_habit=True,
+        )
+        self.other_habit = Habit.objects.create(
+            creator=self.other_user,
+            action="Чужое действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            time_to_complete=60,
+        )
+        self.url = reverse("habits:habits_bulk")
+        self.client.force_authenticate(user=self.user)
+
+    def get_items(self, count):
+        return [
+            {
+                "action": f"Действие {i}",
+                "place": "Тестовое место",
+                "habit_time": "09:00:00",
+                "time_to_complete": 60,
+                "periodicity": self.periodicity.pk,
+                "related_habit": self.enjoyable_habit.pk,
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create(self):
+        """Тест пакетного создания привычек за постоянное число запросов."""
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.post(
+                self.url, {"create": self.get_items(2)}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(
+                self.url, {"create": self.get_items(50)}, format="json"
+            )
+        self.assertEqual(len(small), len(large))
+
+        created = response.json()["created"]
+        self.assertEqual(len(created), 50)
+        self.assertEqual(created[0]["periodicity_display"], "Каждые 2 дня")
+        habit = Habit.objects.get(pk=created[0]["id"])
+        self.assertEqual(habit.creator, self.user)
+        self.assertIsNotNone(habit.next_reminder_at)
+
+    def test_bulk_errors(self):
+        """Тест ошибок по элементам: при любой ошибке ничего не сохраняется."""
+        items = self.get_items(3)
+        items[1]["time_to_complete"] = 121
+        items[2]["periodicity"] = 999
+        data = {
+            "create": items,
+            "update": [{"id": self.other_habit.pk, "action": "Взлом"}],
+            "delete": [self.enjoyable_habit.pk],
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(errors["create"][0], {})
+        self.assertEqual(errors["create"][1], {"non_field_errors": [ERROR_MESSAGES[1]]})
+        self.assertIn("periodicity", errors["create"][2])
+        self.assertEqual(errors["update"], [{"id": [ERROR_MESSAGES[6]]}])
+        self.assertNotIn("delete", errors)
+        self.assertEqual(Habit.objects.count(), 2)
+
+    def test_bulk_update_and_delete(self):
+        """Тест пакетного обновления и удаления привычек."""
+        habit = Habit.objects.create(
+            creator=self.user,
+            action="Старое действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            time_to_complete=60,
+        )
+        old_reminder_at = habit.next_reminder_at
+        data = {
+            "update": [
+                {"id": habit.pk, "action": "Новое действие", "habit_time": "21:00"}
+            ],
+            "delete": [self.enjoyable_habit.pk, self.other_habit.pk],
+        }
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["delete"], [[], [ERROR_MESSAGES[6]]])
+
+        response = self.client.post(
+            self.url, {"update": ["x"], "delete": ["x"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(),
+            {
+                "update": [{"non_field_errors": [ERROR_MESSAGES[12]]}],
+                "delete": [[ERROR_MESSAGES[12]]],
+            },
+        )
+
+        data["delete"] = [self.enjoyable_habit.pk]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["deleted"], [self.enjoyable_habit.pk])
+        habit.refresh_from_db()
+        self.assertEqual(habit.action, "Новое действие")
+        self.assertNotEqual(habit.next_reminder_at, old_reminder_at)
+        self.assertFalse(Habit.objects.filter(pk=self.enjoyable_habit.pk).exists())
+
+
+class HabitValidatedSaveTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.habit = Habit.objects.create(
+            creator=self.user,
+            action="Тестовое действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            reward="Тестовое вознаграждение",
+            time_to_complete=60,
+        )
+        self.enjoyable_habit = Habit.objects.create(
+            creator=self.user,
+            action="Приятное действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            time_to_complete=60,
+            enjoyable_habit=True,
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_api_save_skips_full_clean(self):
+        """Тест сохранения через API без повторной валидации моделью."""
+        data = {
+            "action": "Новое действие",
+            "place": "Тестовое место",
+            "habit_time": "09:00:00",
+            "time_to_complete": 60,
+        }
+        with patch.object(Habit, "full_clean") as full_clean:
+            response = self.client.post(reverse("habits:habit_create"), data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            full_clean.assert_not_called()
+
+            self.habit.save()
+            full_clean.assert_called_once()
+
+    def test_nested_serializer(self):
+        """Тест использования сериализатора как вложенного поля."""
+
+        class NestedSerializer(serializers.Serializer):
+            periodicity = PeriodicitySerializer()
+
+        serializer = NestedSerializer(data={"periodicity": {"value": 2, "unit": "days"}})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_partial_update_validated_against_instance(self):
+        """Тест проверки частичного обновления с учетом текущих значений привычки."""
+        url = reverse("habits:habit_update", args=(self.habit.pk,))
+        response = self.client.patch(url, {"related_habit": self.enjoyable_habit.pk})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {"non_field_errors": [ERROR_MESSAGES[0]]})
+
+    def test_validate_habits(self):
+        """Тест проверки правил модели для списка привычек."""
+        habits = [
+            Habit(reward="Награда", time_to_complete=60),
+            Habit(time_to_complete=121),
+            Habit(enjoyable_habit=True, reward="Награда", time_to_complete=60),
+            Habit(related_habit=self.enjoyable_habit, time_to_complete=60),
+            Habit(related_habit=self.habit, time_to_complete=60),
+        ]
+        with self.assertNumQueries(0):
+            errors = validate_habits(habits)
+        self.assertEqual(
+            errors,
+            {
+                1: [ERROR_MESSAGES[1]],
+                2: [ERROR_MESSAGES[3]],
+                4: [ERROR_MESSAGES[2]],
+            },
+        )
+
+
+class PeriodicityCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.periodicity = Periodicity.objects.create(value=3, unit="hours")
+        for i in range(3):
+            Habit.objects.create(
+                creator=self.user,
+                action=f"Действие {i}",
+                place="Тестовое место",
+                habit_time="08:00:00",
+                time_to_complete=60,
+                periodicity=self.periodicity,
+            )
+
+    def test_format_periodicity_cached(self):
+        """Тест кеширования описания периодичности по (value, unit)."""
+        format_periodicity.cache_clear()
+        self.assertEqual(format_periodicity(3, "hours"), "Каждые 3 часа")
+        self.assertEqual(str(self.periodicity), "Каждые 3 часа")
+        self.assertEqual(format_periodicity.cache_info().hits, 1)
+
+    def test_periodicity_table_refresh(self):
+        """Тест загрузки таблицы периодичностей один раз и обновления при изменении."""
+        with self.assertNumQueries(1):
+            get_periodicity_table()
+        with self.assertNumQueries(0):
+            table = get_periodicity_table()
+        self.assertEqual(table[self.periodicity.pk].unit, "hours")
+
+        self.periodicity.value = 5
+        self.periodicity.save()
+        self.assertEqual(get_periodicity_table()[self.periodicity.pk].value, 5)
+
+        periodicity = Periodicity.objects.create(value=1, unit="week")
+        self.assertIn(periodicity.pk, get_periodicity_table())
+
+    @override_settings(PERIODICITY_TABLE_TIMEOUT=0)
+    def test_periodicity_table_timeout(self):
+        """Тест перечитывания таблицы периодичностей по таймауту без смены версии."""
+        get_periodicity_table()
+        Periodicity.objects.filter(pk=self.periodicity.pk).update(value=7)
+
+        self.assertEqual(get_periodicity_table()[self.periodicity.pk].value, 7)
+
+    def test_serializer_uses_periodicity_table(self):
+        """Тест описания периодичности без загрузки периодичности каждой привычки."""
+        habits = list(Habit.objects.all())
+        get_periodicity_table()
+        with self.assertNumQueries(0):
+            data = HabitSerializer(habits, many=True).data
+        self.assertEqual(
+            [habit["periodicity_display"] for habit in data], ["Каждые 3 часа"] * 3
+        )
+
+
+class HabitValuesSerializationTestCase(APITestCase):
+    def test_serialize_habit_values(self):
+        """Тест совпадения быстрого пути чтения с HabitSerializer."""
+        user = User.objects.create(email="testuser@mail.com")
+        enjoyable_habit = Habit.objects.create(
+            creator=user,
+            action="Приятное действие",
+            place="Тестовое место",
+            habit_time="07:30:00",
+            time_to_complete=30,
+            enjoyable_habit=True,
+            periodicity=None,
+        )
+        Habit.objects.create(
+            creator=user,
+            action="Действие",
+            place="Тестовое место",
+            habit_time="08:00:00",
+            time_to_complete=60,
+            related_habit=enjoyable_habit,
+            periodicity=Periodicity.objects.create(value=12, unit="minutes"),
+            publicity=True,
+        )
+        queryset = Habit.objects.order_by("id")
+        self.assertEqual(
+            serialize_habit_values(queryset.values(*HABIT_VALUES_FIELDS)),
+            HabitSerializer(queryset, many=True).data,
+        )
+        self.assertEqual(
+            list(serialize_habit_values(queryset.values(*HABIT_VALUES_FIELDS))[0]),
+            list(HabitSerializer(queryset, many=True).data[0]),
+        )
+
+
+class HabitExportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.staff = User.objects.create(email="staff@mail.com", is_staff=True)
+        for i, creator in enumerate((self.user, self.user, self.staff)):
+            Habit.objects.create(
+                creator=creator,
+                action=f"Действие {i}",
+                place="Тестовое место",
+                habit_time="08:00:00",
+                time_to_complete=60,
+                publicity=i != 1,
+            )
+        self.url = reverse("habits:habits_export")
+        self.client.force_authenticate(user=self.user)
+
+    def get_content(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        """Тест потоковой выгрузки своих привычек в NDJSON."""
+        response, content = self.get_content({})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        habits = [json.loads(line) for line in content.splitlines()]
+        queryset = Habit.objects.filter(creator=self.user)
+        self.assertEqual(habits, HabitSerializer(queryset, many=True).data)
+
+    def test_export_csv(self):
+        """Тест потоковой выгрузки своих привычек в CSV."""
+        response, content = self.get_content({"type": "csv"})
+        self.assertIn("attachment", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row["action"] for row in rows], ["Действие 0", "Действие 1"])
+        self.assertEqual(rows[0]["periodicity_display"], "Ежедневно")
+
+    def test_export_public_scope(self):
+        """Тест выгрузки всех публичных привычек только для персонала."""
+        response = self.client.get(self.url, {"scope": "public"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.staff)
+        _, content = self.get_content({"scope": "public"})
+        actions = [json.loads(line)["action"] for line in content.splitlines()]
+        self.assertEqual(actions, ["Действие 0", "Действие 2"])
+
+    def test_export_invalid_type(self):
+        """Тест выгрузки в неизвестном формате."""
+        response = self.client.get(self.url, {"type": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("type", response.json())
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "Планы запросов проверяются в PostgreSQL"
+)
+class HabitIndexTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="testuser@mail.com")
+        for i in range(3):
+            Habit.objects.create(
+                creator=self.user,
+                action=f"Действие {i}",
+                place="Тестовое место",
+                habit_time="08:00:00",
+                time_to_complete=60,
+                publicity=i % 2 == 0,
+            )
+        self.client.force_authenticate(user=self.user)
+        with connection.cursor() as cursor:
+            # На маленькой таблице планировщик иначе всегда выбирает seq scan.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def get_plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def assert_page_uses_index(self, url, index):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, {"pagination": "cursor"})
+        page_sql = next(query["sql"] for query in queries if "ORDER BY" in query["sql"])
+        self.assertIn(index, self.get_plan(page_sql))
+
+    def test_habits_list_uses_index(self):
+        """Тест использования индекса (creator_id, id) списком привычек пользователя."""
+        self.assert_page_uses_index(
+            reverse("habits:habits_list"), "habit_creator_id_idx"
+        )
+
+    def test_public_list_uses_index(self):
+        """Тест использования частичного индекса лентой публичных привычек."""
+        self.assert_page_uses_index(
+            reverse("habits:habits_public_list"), "habit_public_id_idx"
+        )
+
+    def test_due_reminders_use_index(self):
+        """Тест использования индекса (next_reminder_at, id) планировщиком."""
+        queryset = (
+            Habit.objects.due(timezone.now())
+            .order_by("next_reminder_at", "id")
+            .values("id")[:1000]
+        )
+        self.assertIn("habit_next_reminder_idx", queryset.explain())
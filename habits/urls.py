@@ -2,7 +2,8 @@ from django.urls import path
 from rest_framework.routers import DefaultRouter
 
 from habits.apps import HabitsConfig
-from habits.views import (HabitCreateApiView, HabitDeleteApiView,
+from habits.views import (HabitBulkApiView, HabitCreateApiView,
+                          HabitDeleteApiView, HabitExportApiView,
                           HabitListApiView, HabitPublicListApiView,
                           HabitRetrieveApiView, HabitUpdateApiView,
                           PeriodicityViewSet)
@@ -15,6 +16,8 @@ urlpatterns = [
     path("", HabitListApiView.as_view(), name="habits_list"),
     path("public/", HabitPublicListApiView.as_view(), name="habits_public_list"),
     path("create/", HabitCreateApiView.as_view(), name="habit_create"),
+    path("bulk/", HabitBulkApiView.as_view(), name="habits_bulk"),
+    path("export/", HabitExportApiView.as_view(), name="habits_export"),
     path("<int:pk>/", HabitRetrieveApiView.as_view(), name="habit_detail"),
     path("<int:pk>/update/", HabitUpdateApiView.as_view(), name="habit_update"),
     path("<int:pk>/delete/", HabitDeleteApiView.as_view(), name="habit_destroy"),
@@ -63,6 +63,36 @@ def validate_enjoyable_habit(enjoyable, reward, related_habit):
         raise serializers.ValidationError(ERROR_MESSAGES[3])
 
 
+def validate_habits(habits):
+    """
+    Проверяет правила модели Habit для списка привычек.
+
+    Выполняет те же проверки, что Habit.clean, но не прерывается на первой
+    некорректной привычке и не обращается к БД, если связанные привычки
+    уже загружены (например, через select_related или in_bulk).
+
+    Args:
+        habits (list[Habit]): Проверяемые привычки
+
+    Returns:
+        dict: Списки сообщений об ошибках по индексам некорректных привычек
+    """
+    errors = {}
+    for index, habit in enumerate(habits):
+        try:
+            validate_reward_and_related(habit.reward, habit.related_habit)
+            validate_time_limit(habit.time_to_complete)
+            validate_related_habit(habit.related_habit)
+            validate_enjoyable_habit(
+                habit.enjoyable_habit, habit.reward, habit.related_habit
+            )
+        except ValidationError as e:
+            errors[index] = e.messages
+        except serializers.ValidationError as e:
+            errors[index] = [str(message) for message in e.detail]
+    return errors
+
+
 def validate_periodicity_object(periodicity):
     """
     Проверяет корректность объекта Periodicity.
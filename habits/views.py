@@ -1,13 +1,26 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.utils.decorators import method_decorator
 from drf_yasg.utils import swagger_auto_schema
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.generics import (CreateAPIView, DestroyAPIView,
-                                     ListAPIView, RetrieveAPIView,
-                                     UpdateAPIView)
+                                     GenericAPIView, ListAPIView,
+                                     RetrieveAPIView, UpdateAPIView)
+from rest_framework.response import Response
+from rest_framework.status import HTTP_304_NOT_MODIFIED
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
+from config.metrics import serializer_timer
+from habits.cache import get_public_habits_cache_key, get_public_habits_etag
+from habits.constans import ERROR_MESSAGES
+from habits.exports import EXPORT_FORMATS
 from habits.models import Habit, Periodicity
 from habits.paginations import CustomPagination
-from habits.serializers import HabitSerializer, PeriodicitySerializer
+from habits.serializers import (HABIT_VALUES_FIELDS, HabitBulkSerializer,
+                                HabitSerializer, PeriodicitySerializer,
+                                serialize_habit_values)
 
 
 class HabitCreateApiView(CreateAPIView):
@@ -20,6 +33,34 @@ class HabitCreateApiView(CreateAPIView):
     serializer_class = HabitSerializer
 
 
+class HabitBulkApiView(GenericAPIView):
+    """
+    API endpoint для пакетного создания, обновления и удаления привычек.
+    Принимает POST запрос с ключами create, update и delete. Изменения
+    сохраняются в одной транзакции, только если все элементы корректны.
+    """
+
+    serializer_class = HabitBulkSerializer
+
+    def post(self, request, *args, **kwargs):
+        """Проверяет и сохраняет пакет изменений привычек."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+        context = self.get_serializer_context()
+        return Response(
+            {
+                "created": HabitSerializer(
+                    result["created"], many=True, context=context
+                ).data,
+                "updated": HabitSerializer(
+                    result["updated"], many=True, context=context
+                ).data,
+                "deleted": result["deleted"],
+            }
+        )
+
+
 class HabitUpdateApiView(UpdateAPIView):
     """
     API endpoint для обновления существующих привычек.
@@ -49,7 +90,9 @@ class HabitRetrieveApiView(RetrieveAPIView):
         """Возвращает только привычки текущего пользователя."""
         if getattr(self, "swagger_fake_view", False):
             return Habit.objects.none()
-        return Habit.objects.filter(creator=self.request.user)
+        return Habit.objects.filter(creator=self.request.user).select_related(
+            "periodicity"
+        )
 
 
 class HabitDeleteApiView(DestroyAPIView):
@@ -68,7 +111,28 @@ class HabitDeleteApiView(DestroyAPIView):
         return Habit.objects.filter(creator=self.request.user)
 
 
-class HabitListApiView(ListAPIView):
+class HabitValuesListMixin:
+    """
+    Примесь для списков привычек с быстрым путем чтения.
+
+    Выбирает только нужные поля через .values() и строит ответ функцией
+    serialize_habit_values (формат совпадает с HabitSerializer).
+    """
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает страницу привычек, сериализованную из строк .values()."""
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *HABIT_VALUES_FIELDS
+        )
+        page = self.paginate_queryset(queryset)
+        with serializer_timer():
+            data = serialize_habit_values(page if page is not None else queryset)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class HabitListApiView(HabitValuesListMixin, ListAPIView):
     """
     API endpoint для просмотра списка привычек текущего пользователя.
     """
@@ -80,18 +144,78 @@ class HabitListApiView(ListAPIView):
         """Возвращает только привычки текущего пользователя."""
         if getattr(self, "swagger_fake_view", False):
             return Habit.objects.none()
-        return Habit.objects.filter(creator=self.request.user)
+        return Habit.objects.filter(creator=self.request.user).select_related(
+            "periodicity"
+        )
+
+
+class HabitExportApiView(APIView):
+    """
+    API endpoint для потоковой выгрузки привычек в NDJSON или CSV.
+
+    Параметры запроса:
+    - type: формат выгрузки (ndjson - по умолчанию, csv)
+    - scope: own - привычки текущего пользователя (по умолчанию),
+      public - все публичные привычки (только для персонала)
+
+    Строки читаются из БД серверным курсором пачками по HABITS_EXPORT_CHUNK_SIZE
+    и сразу отдаются клиенту, поэтому память не растет с числом привычек.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Возвращает потоковый ответ с выгрузкой привычек."""
+        export_format = request.query_params.get("type", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"type": [ERROR_MESSAGES[9].format(", ".join(EXPORT_FORMATS))]}
+            )
+        if request.query_params.get("scope") == "public":
+            if not request.user.is_staff:
+                raise PermissionDenied(ERROR_MESSAGES[10])
+            queryset = Habit.objects.filter(publicity=True)
+        else:
+            queryset = Habit.objects.filter(creator=request.user)
+
+        content_type, extension, render = EXPORT_FORMATS[export_format]
+        rows = (
+            queryset.order_by("id")
+            .values(*HABIT_VALUES_FIELDS)
+            .iterator(chunk_size=settings.HABITS_EXPORT_CHUNK_SIZE)
+        )
+        response = StreamingHttpResponse(render(rows), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="habits.{extension}"'
+        return response
 
 
-class HabitPublicListApiView(ListAPIView):
+class HabitPublicListApiView(HabitValuesListMixin, ListAPIView):
     """
     API endpoint для просмотра публичных привычек всех пользователей.
+
+    Лента одинакова для всех пользователей, поэтому страницы кешируются
+    (по параметрам пагинации) до изменения публичных привычек.
+    Поддерживает условные запросы: ETag/If-None-Match.
     """
 
-    queryset = Habit.objects.filter(publicity=True)
+    queryset = Habit.objects.filter(publicity=True).select_related("periodicity")
     serializer_class = HabitSerializer
     pagination_class = CustomPagination
 
+    def list(self, request, *args, **kwargs):
+        """Возвращает страницу ленты из кеша или 304, если она не изменилась у клиента."""
+        cache_key = get_public_habits_cache_key(request)
+        page = cache.get(cache_key)
+        if page is None:
+            data = super().list(request, *args, **kwargs).data
+            page = (data, get_public_habits_etag(data))
+            cache.set(cache_key, page, settings.PUBLIC_HABITS_CACHE_TIMEOUT)
+        data, etag = page
+
+        headers = {"ETag": etag}
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+            return Response(status=HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, headers=headers)
+
 
 @method_decorator(
     name="list",
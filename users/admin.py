@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.admin import ModelAdmin
 
-from users.models import User
+from users.models import FailedMessage, User
 
 
 @admin.register(User)
@@ -9,3 +9,11 @@ class UserAdmin(ModelAdmin):
     """Административный интерфейс для модели User."""
 
     list_filter = ("id", "email", "tg_chat_id")
+
+
+@admin.register(FailedMessage)
+class FailedMessageAdmin(ModelAdmin):
+    """Административный интерфейс для модели FailedMessage."""
+
+    list_display = ("chat_id", "attempts", "created_at")
+    list_filter = ("chat_id", "created_at")
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        """Подключает проверки, обработчики сигналов и замер (если он включен)."""
+        import users.checks  # noqa: F401
+        import users.signals  # noqa: F401
+
+        if settings.METRICS_ENABLED:
+            from config.metrics import install
+
+            install()
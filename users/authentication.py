@@ -0,0 +1,109 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+
+USER_CACHE_KEY = "users:auth:{}"
+
+# Поля пользователя, которые нужны при обработке запросов API. Остальные поля
+# объекта из кеша отложены и загружаются из БД при первом обращении.
+USER_CACHE_FIELDS = (
+    "id",
+    "email",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "tg_chat_id",
+    "timezone",
+)
+
+
+def get_user_cache_key(user_id):
+    """Возвращает ключ кеша пользователя для аутентификации."""
+    return USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_user_cache(user_id):
+    """
+    Удаляет пользователя из кеша аутентификации.
+
+    Ключ удаляется сразу и еще раз после фиксации транзакции: иначе параллельный
+    запрос мог бы закешировать еще не зафиксированное состояние пользователя.
+
+    Args:
+        user_id (int): Идентификатор пользователя
+    """
+    key = get_user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Аутентификация по JWT с кешированием пользователя.
+
+    Вместо запроса к БД на каждый запрос API пользователь собирается из кеша
+    (поля USER_CACHE_FIELDS). Запись живет не дольше JWT_USER_CACHE_TIMEOUT
+    и срока действия токена и удаляется при сохранении или удалении
+    пользователя (users.signals). Без общего кеша (CACHE_URL) удаление видно
+    только текущему процессу, поэтому остальные процессы видят изменения
+    флагов пользователя не позже чем через JWT_USER_CACHE_TIMEOUT.
+    При CHECK_REVOKE_TOKEN (нужен хеш пароля) пользователь всегда читается из БД.
+    """
+
+    def get_user(self, validated_token):
+        """
+        Возвращает пользователя токена из кеша или из БД.
+
+        Args:
+            validated_token (Token): Проверенный токен
+
+        Returns:
+            User: Пользователь (из кеша - с отложенными полями вне USER_CACHE_FIELDS)
+
+        Raises:
+            InvalidToken: В токене нет идентификатора пользователя
+            AuthenticationFailed: Пользователь не найден или не активен
+        """
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = get_user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            user = super().get_user(validated_token)
+            timeout = min(
+                int(validated_token["exp"] - time.time()),
+                settings.JWT_USER_CACHE_TIMEOUT,
+            )
+            if timeout > 0:
+                cache.set(
+                    key,
+                    {field: getattr(user, field) for field in USER_CACHE_FIELDS},
+                    timeout=timeout,
+                )
+            return user
+
+        # from_db ожидает значения в порядке полей модели.
+        field_names = [
+            field.attname
+            for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        user = User.from_db(
+            User.objects.db, field_names, [values[name] for name in field_names]
+        )
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from rest_framework_simplejwt.settings import api_settings
+
+# Кеши, данные которых не видны другим процессам.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.security, Tags.caches)
+def check_revoked_tokens_cache(app_configs, **kwargs):
+    """
+    Проверяет, что отозванные refresh-токены хранятся в общем кеше.
+
+    При ротации refresh-токенов отзыв хранится в кеше по умолчанию. Кеш
+    в памяти процесса не виден остальным процессам и вытесняет записи, поэтому
+    отозванный токен можно было бы использовать повторно.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if api_settings.ROTATE_REFRESH_TOKENS and backend in PROCESS_LOCAL_CACHES:
+        return [
+            Error(
+                f"Отозванные refresh-токены нельзя хранить в кеше {backend}.",
+                hint="Задайте CACHE_URL (например, redis://localhost:6379/0).",
+                id="users.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,3 @@
+ERROR_MESSAGES = [
+    "Неизвестный часовой пояс.",
+]
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id с параметрами из настроек PASSWORD_ARGON2_*.
+
+    Хеши с другими параметрами пересчитываются при следующем входе (must_update).
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    Scrypt с параметром стоимости из настройки PASSWORD_SCRYPT_WORK_FACTOR.
+
+    Хеши с другими параметрами пересчитываются при следующем входе (must_update).
+    """
+
+    # Предел памяти OpenSSL: позволяет проверять хеши с work_factor до 2**17.
+    maxmem = 256 * 1024 * 1024
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 с количеством итераций из настройки PASSWORD_PBKDF2_ITERATIONS.
+
+    Хеши с другим количеством итераций пересчитываются при следующем входе.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
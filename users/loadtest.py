@@ -0,0 +1,320 @@
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import httpx
+from django.conf import settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+# Доли запросов к каждой конечной точке в смеси нагрузки.
+TRAFFIC_MIX = (
+    ("public", 30),
+    ("list", 25),
+    ("create", 12),
+    ("update", 10),
+    ("retrieve", 8),
+    ("login", 8),
+    ("profile", 4),
+    ("register", 3),
+)
+
+PASSWORD = "loadtest-password"
+
+
+class InProcessTarget:
+    """Цель нагрузки внутри процесса: запросы через APIClient без сети."""
+
+    def __init__(self):
+        host = next(
+            (host for host in settings.ALLOWED_HOSTS if host not in ("*", "")),
+            "localhost",
+        )
+        self.client = APIClient(HTTP_HOST=host.lstrip("."))
+
+    def request(self, method, path, data=None, token=None):
+        """
+        Выполняет запрос к API.
+
+        Returns:
+            tuple: Код ответа и тело ответа (dict или None)
+        """
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        response = getattr(self.client, method)(path, data, format="json", **headers)
+        return response.status_code, getattr(response, "data", None)
+
+    def close(self):
+        """Освобождает ресурсы цели."""
+
+
+class HttpTarget:
+    """Цель нагрузки по HTTP (например, локальный gunicorn)."""
+
+    def __init__(self, base_url):
+        self.client = httpx.Client(base_url=base_url, timeout=30)
+
+    def request(self, method, path, data=None, token=None):
+        """
+        Выполняет запрос к API.
+
+        Returns:
+            tuple: Код ответа и тело ответа (dict или None)
+        """
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if method == "get":
+            response = self.client.get(path, params=data, headers=headers)
+        else:
+            response = self.client.request(
+                method.upper(), path, json=data, headers=headers
+            )
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body
+
+    def close(self):
+        """Закрывает HTTP-соединения."""
+        self.client.close()
+
+
+class VirtualUser:
+    """
+    Виртуальный пользователь: регистрируется, входит и выполняет смесь запросов.
+
+    Attributes:
+        target: Цель нагрузки (InProcessTarget или HttpTarget)
+        rng (random.Random): Генератор случайных чисел пользователя
+        email (str): Email пользователя
+        token (str): Access-токен
+        user_id (int): Идентификатор пользователя
+        habit_ids (list[int]): Созданные пользователем привычки
+    """
+
+    def __init__(self, target, rng, tag):
+        self.target = target
+        self.rng = rng
+        self.tag = tag
+        self.email = None
+        self.token = None
+        self.user_id = None
+        self.habit_ids = []
+
+    def new_email(self):
+        """Возвращает уникальный email для регистрации."""
+        return f"load-{self.tag}-{self.rng.getrandbits(48):x}@example.com"
+
+    def habit_data(self):
+        """Возвращает данные случайной привычки."""
+        return {
+            "action": f"Действие {self.rng.randint(1, 1000)}",
+            "place": self.rng.choice(["Дом", "Парк", "Офис", "Спортзал"]),
+            "habit_time": f"{self.rng.randint(6, 22):02d}:{self.rng.choice([0, 15, 30, 45]):02d}",
+            "time_to_complete": self.rng.randint(10, 120),
+            "publicity": self.rng.random() < 0.3,
+        }
+
+    def register(self):
+        """Регистрирует нового пользователя (без входа)."""
+        email = self.new_email()
+        status, body = self.target.request(
+            "post", reverse("users:register"), {"email": email, "password": PASSWORD}
+        )
+        return status, email, body
+
+    def login(self):
+        """Получает токен пользователя."""
+        status, body = self.target.request(
+            "post", reverse("users:login"), {"email": self.email, "password": PASSWORD}
+        )
+        if status == 200:
+            self.token = body["access"]
+        return status
+
+    def create_habit(self):
+        """Создает привычку пользователя."""
+        status, body = self.target.request(
+            "post", reverse("habits:habit_create"), self.habit_data(), self.token
+        )
+        if status == 201:
+            self.habit_ids.append(body["id"])
+        return status
+
+    def sign_up(self):
+        """Регистрирует пользователя, входит и создает первую привычку (подготовка)."""
+        status, self.email, body = self.register()
+        if status != 201:
+            raise RuntimeError(f"Регистрация не удалась: {status} {body}")
+        self.user_id = body["id"]
+        if self.login() != 200 or self.create_habit() != 201:
+            raise RuntimeError("Подготовка пользователя не удалась")
+
+    def run(self, endpoint):
+        """
+        Выполняет один запрос смеси.
+
+        Args:
+            endpoint (str): Имя конечной точки из TRAFFIC_MIX
+
+        Returns:
+            int: Код ответа
+        """
+        request = self.target.request
+        if endpoint == "public":
+            return request(
+                "get", reverse("habits:habits_public_list"), token=self.token
+            )[0]
+        if endpoint == "list":
+            return request("get", reverse("habits:habits_list"), token=self.token)[0]
+        if endpoint == "profile":
+            url = reverse("users:profile", args=(self.user_id,))
+            return request("get", url, token=self.token)[0]
+        if endpoint == "login":
+            return self.login()
+        if endpoint == "register":
+            return self.register()[0]
+        if endpoint == "create":
+            return self.create_habit()
+        habit_id = self.rng.choice(self.habit_ids)
+        if endpoint == "update":
+            url = reverse("habits:habit_update", args=(habit_id,))
+            data = {"action": f"Действие {self.rng.randint(1, 1000)}"}
+            return request("patch", url, data, self.token)[0]
+        url = reverse("habits:habit_detail", args=(habit_id,))
+        return request("get", url, token=self.token)[0]
+
+
+def percentile(values, percent):
+    """Возвращает перцентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(samples, wall_time):
+    """
+    Сводит замеры запросов по конечным точкам.
+
+    Args:
+        samples (list): Тройки (конечная точка, длительность в секундах, код ответа)
+        wall_time (float): Общее время нагрузки (с)
+
+    Returns:
+        dict: p50/p95/p99 (мс), запросов в секунду и ошибки по конечным точкам и итого
+    """
+    groups = {}
+    for endpoint, duration, status in samples:
+        groups.setdefault(endpoint, []).append((duration, status))
+    groups["total"] = [(duration, status) for _, duration, status in samples]
+
+    results = {}
+    for endpoint, items in sorted(groups.items()):
+        durations = [duration for duration, _ in items]
+        results[endpoint] = {
+            "requests": len(items),
+            "errors": sum(status >= 400 for _, status in items),
+            "p50_ms": round(percentile(durations, 50) * 1000, 2),
+            "p95_ms": round(percentile(durations, 95) * 1000, 2),
+            "p99_ms": round(percentile(durations, 99) * 1000, 2),
+            "rps": round(len(items) / wall_time, 1) if wall_time else None,
+        }
+    return results
+
+
+def split_requests(requests, concurrency):
+    """Делит запросы между потоками: остаток достается первым потокам."""
+    share, remainder = divmod(requests, concurrency)
+    return [share + (worker < remainder) for worker in range(concurrency)]
+
+
+def run_load(target_factory, requests, users, concurrency, seed):
+    """
+    Выполняет нагрузку смесью запросов TRAFFIC_MIX.
+
+    Виртуальные пользователи делятся между concurrency потоками, у каждого
+    потока своя цель (свой клиент). Подготовка (регистрация и вход) в замер
+    не входит.
+
+    Args:
+        target_factory (callable): Создает цель нагрузки для потока
+        requests (int): Общее количество запросов
+        users (int): Количество виртуальных пользователей
+        concurrency (int): Количество потоков
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        dict: Сводка summarize по конечным точкам
+    """
+    endpoints = [endpoint for endpoint, _ in TRAFFIC_MIX]
+    weights = [weight for _, weight in TRAFFIC_MIX]
+    concurrency = max(min(concurrency, users), 1)
+
+    workers = []
+    for worker, worker_requests in enumerate(split_requests(requests, concurrency)):
+        target = target_factory()
+        rng = random.Random(seed * 1000 + worker)
+        worker_users = [
+            VirtualUser(target, rng, f"{seed}-{worker}-{i}")
+            for i in range(worker, users, concurrency)
+        ]
+        for user in worker_users:
+            user.sign_up()
+        plan = rng.choices(endpoints, weights=weights, k=worker_requests)
+        workers.append((target, rng, worker_users, plan))
+
+    def work(target, rng, worker_users, plan):
+        samples = []
+        for endpoint in plan:
+            user = rng.choice(worker_users)
+            started_at = time.perf_counter()
+            status = user.run(endpoint)
+            samples.append((endpoint, time.perf_counter() - started_at, status))
+        target.close()
+        return samples
+
+    started_at = time.perf_counter()
+    if concurrency == 1:
+        samples = work(*workers[0])
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(work, *worker) for worker in workers]
+            samples = [sample for future in futures for sample in future.result()]
+    return summarize(samples, time.perf_counter() - started_at)
+
+
+def compare_results(base, current):
+    """
+    Сравнивает две сводки нагрузки.
+
+    Args:
+        base (dict): Сводка предыдущего запуска
+        current (dict): Сводка текущего запуска
+
+    Returns:
+        dict: По конечным точкам и метрикам - прежнее, новое значение и изменение в процентах
+    """
+    diff = {}
+    for endpoint in sorted(set(base) & set(current)):
+        diff[endpoint] = {}
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            before = base[endpoint].get(metric)
+            after = current[endpoint].get(metric)
+            change = (
+                round((after - before) / before * 100, 1)
+                if before and after is not None
+                else None
+            )
+            diff[endpoint][metric] = {
+                "base": before,
+                "current": after,
+                "change_pct": change,
+            }
+    return diff
+
+
+def make_target_factory(target_url=None):
+    """Возвращает фабрику целей: HTTP по target_url или внутри процесса."""
+    if target_url:
+        return lambda: HttpTarget(urljoin(target_url, "/"))
+    return InProcessTarget
@@ -0,0 +1,108 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils.module_loading import import_string
+
+from habits.benchmarks import write_report
+
+# Атрибуты стоимости хешеров, попадающие в отчет.
+HASHER_PARAMS = (
+    "iterations",
+    "time_cost",
+    "memory_cost",
+    "work_factor",
+    "block_size",
+    "parallelism",
+)
+
+BASELINE_HASHER = "pbkdf2"
+
+
+class Command(BaseCommand):
+    """
+    Команда для замера стоимости проверки пароля при входе.
+
+    Для каждого алгоритма из PASSWORD_HASHER_CLASSES с параметрами из настроек
+    хеширует пароль и многократно проверяет его (как при входе). Процессорное
+    время проверки дает количество входов в секунду на одно ядро; ускорение
+    считается относительно PBKDF2 (алгоритм Django по умолчанию).
+    Результат выводится в JSON.
+    Пример использования:
+        python manage.py bench_hashers --repeat 20 --output bench.json
+    """
+
+    help = "Замер скорости проверки паролей разными алгоритмами"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hashers",
+            nargs="+",
+            choices=list(settings.PASSWORD_HASHER_CLASSES),
+            default=list(settings.PASSWORD_HASHER_CLASSES),
+        )
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--output", help="Файл для JSON-отчета")
+
+    def handle(self, *args, **options):
+        """Выполняет замер и выводит отчет."""
+        results = {
+            name: self.measure(
+                import_string(settings.PASSWORD_HASHER_CLASSES[name])(),
+                options["repeat"],
+            )
+            for name in options["hashers"]
+        }
+        baseline = results.get(BASELINE_HASHER)
+        for result in results.values():
+            result["speedup"] = (
+                round(baseline["cpu_ms"] / result["cpu_ms"], 1)
+                if baseline and result["cpu_ms"]
+                else None
+            )
+        write_report(
+            {
+                "benchmark": "hashers",
+                "params": {
+                    "repeat": options["repeat"],
+                    "default_hasher": settings.PASSWORD_HASHER,
+                },
+                "results": results,
+            },
+            options["output"],
+            self.stdout,
+        )
+
+    @staticmethod
+    def measure(hasher, repeat):
+        """
+        Замеряет проверку пароля хешером.
+
+        Args:
+            hasher (BasePasswordHasher): Хешер
+            repeat (int): Количество проверок
+
+        Returns:
+            dict: Параметры хешера, медианное время проверки, процессорное время
+                проверки и количество входов в секунду на ядро
+        """
+        encoded = hasher.encode("benchmark-password", hasher.salt())
+        wall_times = []
+        cpu_started_at = time.process_time()
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            hasher.verify("benchmark-password", encoded)
+            wall_times.append(time.perf_counter() - started_at)
+        cpu_ms = (time.process_time() - cpu_started_at) / repeat * 1000
+
+        return {
+            "params": {
+                param: getattr(hasher, param)
+                for param in HASHER_PARAMS
+                if hasattr(hasher, param)
+            },
+            "verify_ms": round(statistics.median(wall_times) * 1000, 2),
+            "cpu_ms": round(cpu_ms, 2),
+            "logins_per_core_second": round(1000 / cpu_ms, 1) if cpu_ms else None,
+        }
@@ -0,0 +1,103 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from config.celery import app as celery_app
+from habits.benchmarks import run_with_synthetic_data, write_report
+from habits.models import Habit
+from users.tasks import check_habits_and_send_reminders
+
+
+class Command(BaseCommand):
+    """
+    Команда для замера производительности рассылки напоминаний.
+
+    Создает N пользователей и M привычек с реалистичным распределением
+    habit_time, периодичности и tg_chat_id, делает часть привычек наступившими
+    и выполняет check_habits_and_send_reminders целиком (Celery в eager-режиме,
+    отправка в Telegram заменена заглушкой). Все данные откатываются.
+    Результат (запросы, время, сообщения в секунду) выводится в JSON.
+    Пример использования:
+        python manage.py bench_reminders --users 10000 --habits 100000 --output bench.json
+    """
+
+    help = "Замер производительности check_habits_and_send_reminders"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--habits", type=int, default=10000)
+        parser.add_argument(
+            "--due", type=float, default=1.0, help="Доля наступивших привычек"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Файл для JSON-отчета")
+
+    def handle(self, *args, **options):
+        """Выполняет замер и выводит отчет."""
+        results = run_with_synthetic_data(
+            options["users"],
+            options["habits"],
+            options["seed"],
+            lambda habits: self.measure(habits, options["due"]),
+        )
+        write_report(
+            {
+                "benchmark": "reminders",
+                "params": {
+                    key: options[key] for key in ("users", "habits", "due", "seed")
+                },
+                "results": results,
+            },
+            options["output"],
+            self.stdout,
+        )
+
+    @staticmethod
+    def measure(habits, due):
+        """
+        Делает долю due привычек наступившими и замеряет один запуск планировщика.
+
+        Args:
+            habits (list[Habit]): Созданные привычки
+            due (float): Доля наступивших привычек
+
+        Returns:
+            dict: Количество запросов, время, число сообщений и сообщений в секунду
+        """
+        now = timezone.now()
+        due_ids = [habit.id for habit in habits[: int(len(habits) * due)]]
+        Habit.objects.filter(id__in=due_ids).update(
+            next_reminder_at=now - timedelta(minutes=1)
+        )
+        sent = []
+
+        def send_stub(messages):
+            sent.extend(messages)
+            return [{"ok": True}] * len(messages)
+
+        always_eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+        try:
+            with patch("users.tasks.send_telegram_messages", send_stub):
+                with CaptureQueriesContext(connection) as queries:
+                    started_at = time.perf_counter()
+                    chunks = check_habits_and_send_reminders()
+                    wall_time = time.perf_counter() - started_at
+        finally:
+            celery_app.conf.task_always_eager = always_eager
+
+        return {
+            "habits_due": len(due_ids),
+            "chunks": chunks,
+            "messages": len(sent),
+            "queries": len(queries),
+            "wall_time_s": round(wall_time, 4),
+            "messages_per_second": (
+                round(len(sent) / wall_time, 1) if wall_time else None
+            ),
+        }
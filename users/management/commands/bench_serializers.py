@@ -0,0 +1,99 @@
+import statistics
+import time
+
+from django.core.management import BaseCommand
+
+from habits.benchmarks import run_with_synthetic_data, write_report
+from habits.models import Habit
+from habits.serializers import (HABIT_VALUES_FIELDS, HabitSerializer,
+                                serialize_habit_values)
+
+
+class Command(BaseCommand):
+    """
+    Команда для сравнения скорости чтения списков привычек.
+
+    Создает синтетические привычки и для каждого размера страницы замеряет
+    медианное время получения и сериализации страницы двумя путями:
+    HabitSerializer по объектам модели и serialize_habit_values по строкам
+    .values(). Все данные откатываются. Результат выводится в JSON.
+    Пример использования:
+        python manage.py bench_serializers --sizes 10 100 1000 --output bench.json
+    """
+
+    help = "Сравнение HabitSerializer и serialize_habit_values"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--habits", type=int, default=1000)
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Файл для JSON-отчета")
+
+    def handle(self, *args, **options):
+        """Выполняет замер и выводит отчет."""
+        habits = max(options["habits"], *options["sizes"])
+        results = run_with_synthetic_data(
+            options["users"],
+            habits,
+            options["seed"],
+            lambda created: self.measure(options["sizes"], options["repeat"]),
+        )
+        write_report(
+            {
+                "benchmark": "serializers",
+                "params": {
+                    "users": options["users"],
+                    "habits": habits,
+                    "repeat": options["repeat"],
+                    "seed": options["seed"],
+                },
+                "results": results,
+            },
+            options["output"],
+            self.stdout,
+        )
+
+    @staticmethod
+    def timeit(func, repeat):
+        """Возвращает медианное время выполнения func в миллисекундах."""
+        timings = []
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started_at)
+        return round(statistics.median(timings) * 1000, 3)
+
+    def measure(self, sizes, repeat):
+        """
+        Замеряет оба пути чтения для каждого размера страницы.
+
+        Args:
+            sizes (list[int]): Размеры страниц
+            repeat (int): Количество повторов каждого замера
+
+        Returns:
+            dict: Медианное время (мс) и ускорение по размерам страниц
+        """
+        queryset = Habit.objects.order_by("id")
+        results = {}
+        for size in sizes:
+            serializer_ms = self.timeit(
+                lambda: HabitSerializer(
+                    list(queryset.select_related("periodicity")[:size]), many=True
+                ).data,
+                repeat,
+            )
+            values_ms = self.timeit(
+                lambda: serialize_habit_values(
+                    queryset.values(*HABIT_VALUES_FIELDS)[:size]
+                ),
+                repeat,
+            )
+            results[size] = {
+                "serializer_ms": serializer_ms,
+                "values_ms": values_ms,
+                "speedup": round(serializer_ms / values_ms, 2) if values_ms else None,
+            }
+        return results
@@ -0,0 +1,98 @@
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+
+from habits.imports import READERS, load_habits, prepare_batch
+
+
+class Command(BaseCommand):
+    """
+    Команда для массового импорта привычек из CSV или NDJSON.
+
+    Файл читается потоково пачками по --batch-size строк. Каждая пачка
+    проверяется по правилам habits.validators за один проход (создатели,
+    связанные привычки и периодичности - одним запросом на пачку) и
+    загружается одной транзакцией: в PostgreSQL командой COPY, иначе bulk_create.
+    Отклоненные строки с ошибками выводятся в NDJSON (stderr или --rejects).
+
+    Колонки: creator_email, place, habit_time, action, enjoyable_habit,
+    related_habit, periodicity, reward, time_to_complete, publicity
+    (формат выгрузки /habits/export/ подходит при указании --creator).
+    Пример использования:
+        python manage.py import_habits habits.csv --create-users --rejects rejects.ndjson
+    """
+
+    help = "Импорт привычек из CSV или NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу")
+        parser.add_argument(
+            "--type",
+            choices=READERS,
+            help="Формат файла (по умолчанию - по расширению)",
+        )
+        parser.add_argument(
+            "--creator", help="Email создателя для строк без creator_email"
+        )
+        parser.add_argument(
+            "--create-users",
+            action="store_true",
+            help="Создавать отсутствующих пользователей",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--rejects", help="Файл для отклоненных строк (по умолчанию - stderr)"
+        )
+
+    def handle(self, *args, **options):
+        """Импортирует привычки и выводит отчет."""
+        path = Path(options["path"])
+        file_type = options["type"] or path.suffix.lstrip(".").lower()
+        if file_type not in READERS:
+            raise CommandError(f"Неизвестный формат файла: {file_type}")
+
+        started_at = time.perf_counter()
+        imported = rejected = 0
+        rejects_file = (
+            open(options["rejects"], "w", encoding="utf-8")
+            if options["rejects"]
+            else None
+        )
+        try:
+            with path.open(encoding="utf-8", newline="") as file:
+                rows = READERS[file_type](file)
+                while batch := list(islice(rows, options["batch_size"])):
+                    habits, rejects = prepare_batch(
+                        batch, options["creator"], options["create_users"]
+                    )
+                    load_habits(habits, options["batch_size"])
+                    imported += len(habits)
+                    rejected += len(rejects)
+                    for line, errors, row in rejects:
+                        self.write_reject(rejects_file, line, errors, row)
+        finally:
+            if rejects_file is not None:
+                rejects_file.close()
+
+        elapsed = time.perf_counter() - started_at
+        total = imported + rejected
+        rate = round(total / elapsed, 1) if elapsed else total
+        self.stdout.write(
+            f"Обработано строк: {total} за {elapsed:.2f} с ({rate} строк/с), "
+            f"импортировано: {imported}, отклонено: {rejected}"
+        )
+
+    def write_reject(self, rejects_file, line, errors, row):
+        """Выводит отклоненную строку с ошибками в формате NDJSON."""
+        content = json.dumps(
+            {"line": line, "errors": errors, "row": row},
+            ensure_ascii=False,
+            default=str,
+        )
+        if rejects_file is not None:
+            rejects_file.write(content + "\n")
+        else:
+            self.stderr.write(content)
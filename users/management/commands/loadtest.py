@@ -0,0 +1,87 @@
+import json
+from functools import partial
+
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from habits.benchmarks import BenchmarkRollback, write_report
+from users.loadtest import compare_results, make_target_factory, run_load
+
+
+class Command(BaseCommand):
+    """
+    Команда нагрузочного тестирования HTTP API без внешних сервисов.
+
+    Виртуальные пользователи регистрируются, входят и выполняют смесь запросов
+    (публичная лента, свои привычки, создание, обновление, просмотр, вход,
+    профиль, регистрация). По умолчанию запросы выполняются внутри процесса
+    (APIClient) в транзакции, которая затем откатывается; с --target - по HTTP
+    к запущенному серверу (например, локальному gunicorn), данные остаются в его БД.
+    Отчет (p50/p95/p99, запросов в секунду, ошибки по конечным точкам)
+    выводится в JSON; --compare добавляет сравнение с предыдущим отчетом.
+    Пример использования:
+        python manage.py loadtest --requests 2000 --output after.json --compare before.json
+        python manage.py loadtest --target http://127.0.0.1:8000 --concurrency 8
+    """
+
+    help = "Нагрузочное тестирование HTTP API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Количество потоков (только с --target)",
+        )
+        parser.add_argument(
+            "--target", help="URL сервера, например http://127.0.0.1:8000"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Файл для JSON-отчета")
+        parser.add_argument("--compare", help="JSON-отчет предыдущего запуска")
+
+    def handle(self, *args, **options):
+        """Выполняет нагрузку и выводит отчет."""
+        target = options["target"]
+        # Внутри процесса все запросы идут через одно соединение с БД в общей транзакции.
+        concurrency = options["concurrency"] if target else 1
+        load = partial(
+            run_load,
+            make_target_factory(target),
+            options["requests"],
+            options["users"],
+            concurrency,
+            options["seed"],
+        )
+        if target:
+            results = load()
+        else:
+            results = {}
+            try:
+                with transaction.atomic():
+                    results = load()
+                    raise BenchmarkRollback
+            except BenchmarkRollback:
+                pass
+
+        report = {
+            "benchmark": "loadtest",
+            "params": {
+                "requests": options["requests"],
+                "users": options["users"],
+                "concurrency": concurrency,
+                "target": target or "in-process",
+                "seed": options["seed"],
+            },
+            "results": results,
+        }
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as file:
+                base = json.load(file)
+            report["compare"] = {
+                "base_commit": base.get("commit"),
+                "diff": compare_results(base["results"], results),
+            }
+        write_report(report, options["output"], self.stdout)
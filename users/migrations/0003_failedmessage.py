@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_remove_user_tg_nickname_user_tg_chat_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FailedMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "chat_id",
+                    models.CharField(max_length=50, verbose_name="Чат-id в телеграме"),
+                ),
+                ("message", models.TextField(verbose_name="Текст сообщения")),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(verbose_name="Количество попыток"),
+                ),
+                ("error", models.TextField(verbose_name="Ошибка")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Создано"),
+                ),
+            ],
+            options={
+                "verbose_name": "Неотправленное сообщение",
+                "verbose_name_plural": "Неотправленные сообщения",
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-16 20:57
+
+from django.db import migrations, models
+
+import users.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_failedmessage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="timezone",
+            field=models.CharField(
+                default="Europe/Moscow",
+                max_length=63,
+                validators=[users.validators.validate_timezone],
+                verbose_name="Часовой пояс",
+            ),
+        ),
+    ]
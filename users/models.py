@@ -1,6 +1,11 @@
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from users.validators import validate_timezone
+
 
 class User(AbstractUser):
     """
@@ -11,6 +16,7 @@ class User(AbstractUser):
         email (EmailField): Уникальный email пользователя (используется для входа)
         phone (CharField): Номер телефона (необязательный)
         tg_chat_id (CharField): ID чата в Telegram для уведомлений (необязательный)
+        timezone (CharField): Часовой пояс пользователя (имя IANA), в нем задано время привычек
     """
 
     username = None
@@ -22,6 +28,12 @@ class User(AbstractUser):
     tg_chat_id = models.CharField(
         max_length=50, blank=True, null=True, verbose_name="Чат-id в телеграме"
     )
+    timezone = models.CharField(
+        max_length=63,
+        default=settings.TIME_ZONE,
+        validators=[validate_timezone],
+        verbose_name="Часовой пояс",
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -33,3 +45,51 @@ class User(AbstractUser):
     def __str__(self):
         """Строковое представление пользователя (email)."""
         return self.email
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженный из БД часовой пояс."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_timezone = instance.__dict__.get("timezone")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Сохранение с запоминанием сохраненного часового пояса."""
+        super().save(*args, **kwargs)
+        self._loaded_timezone = self.timezone
+
+    def timezone_changed(self):
+        """Проверяет, изменился ли часовой пояс с момента загрузки из БД."""
+        loaded = getattr(self, "_loaded_timezone", None)
+        return loaded is not None and loaded != self.timezone
+
+    def get_timezone(self):
+        """Возвращает часовой пояс пользователя как tzinfo."""
+        return ZoneInfo(self.timezone)
+
+
+class FailedMessage(models.Model):
+    """
+    Сообщение Telegram, которое не удалось отправить (dead-letter).
+
+    Attributes:
+        chat_id (CharField): ID чата в Telegram
+        message (TextField): Текст сообщения
+        attempts (PositiveIntegerField): Количество сделанных попыток отправки
+        error (TextField): Последняя ошибка отправки
+        created_at (DateTimeField): Время сохранения сообщения
+    """
+
+    chat_id = models.CharField(max_length=50, verbose_name="Чат-id в телеграме")
+    message = models.TextField(verbose_name="Текст сообщения")
+    attempts = models.PositiveIntegerField(verbose_name="Количество попыток")
+    error = models.TextField(verbose_name="Ошибка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создано")
+
+    class Meta:
+        verbose_name = "Неотправленное сообщение"
+        verbose_name_plural = "Неотправленные сообщения"
+
+    def __str__(self):
+        """Строковое представление сообщения."""
+        return f"{self.chat_id}: {self.message[:50]}"
@@ -1,7 +1,14 @@
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.serializers import ModelSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from users.models import User
+from users.tokens import is_token_revoked, revoke_token
 
 
 class UserSerializer(ModelSerializer):
@@ -16,7 +23,7 @@ class UserSerializer(ModelSerializer):
 
     class Meta:
         model = User
-        fields = ["id", "email", "phone", "tg_chat_id", "password"]
+        fields = ["id", "email", "phone", "tg_chat_id", "timezone", "password"]
 
     def create(self, validated_data):
         password = validated_data.pop("password")
@@ -25,3 +32,57 @@ class UserSerializer(ModelSerializer):
         user.is_active = True
         user.save()
         return user
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Обновление токенов с проверкой отзыва refresh-токена.
+
+    При ротации (ROTATE_REFRESH_TOKENS) переданный refresh-токен отзывается
+    в том же атомарном действии, что и проверка, поэтому им можно
+    воспользоваться только один раз. Таблицы выданных токенов
+    (token_blacklist) не используются.
+    """
+
+    def validate(self, attrs):
+        """
+        Проверяет refresh-токен и выпускает новые токены.
+
+        Raises:
+            InvalidToken: Токен отозван
+            AuthenticationFailed: Пользователь токена не найден или не активен
+        """
+        refresh = self.token_class(attrs["refresh"])
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            revoked = not revoke_token(refresh)
+        else:
+            revoked = is_token_revoked(refresh)
+        if revoked:
+            raise InvalidToken(_("Token is blacklisted"))
+
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    """Отзыв refresh-токена (выход из системы)."""
+
+    refresh = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        """Отзывает переданный refresh-токен."""
+        revoke_token(RefreshToken(attrs["refresh"]))
+        return {}
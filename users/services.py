@@ -1,6 +1,66 @@
+import asyncio
+import logging
+
+import httpx
 import requests
 
-from config.settings import BOT_TOKEN, TELEGRAM_URL
+from config.settings import (BOT_TOKEN, TELEGRAM_CHAT_RATE,
+                             TELEGRAM_GLOBAL_RATE, TELEGRAM_MAX_ATTEMPTS,
+                             TELEGRAM_MAX_CONNECTIONS, TELEGRAM_RETRY_BACKOFF,
+                             TELEGRAM_TIMEOUT, TELEGRAM_URL)
+from users.models import FailedMessage
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+MESSAGE_SEPARATOR = "\n\n"
+
+REMINDER_TEMPLATE = (
+    "Напоминание о привычке:\n"
+    "Я должен {action} в {habit_time}. Место выполнения: {place}\n"
+    "Время на выполнение: {time_to_complete} секунд"
+)
+
+
+def format_reminder_message(habit):
+    """
+    Формирует текст напоминания о привычке.
+
+    Args:
+        habit (dict): Поля привычки: action, habit_time, place, time_to_complete
+
+    Returns:
+        str: Текст напоминания
+    """
+    return REMINDER_TEMPLATE.format(**habit)
+
+
+def coalesce_messages(messages, limit=TELEGRAM_MESSAGE_LIMIT):
+    """
+    Объединяет сообщения в один чат в одно сообщение.
+
+    Объединенный текст не превышает limit символов: при превышении он делится
+    на несколько сообщений по границам исходных сообщений.
+
+    Args:
+        messages (list): Пары (chat_id, текст сообщения)
+        limit (int): Максимальная длина одного сообщения
+
+    Returns:
+        list: Пары (chat_id, объединенный текст) в порядке первого появления чата,
+        по несколько на чат при делении по limit
+    """
+    texts = {}
+    for chat_id, message in messages:
+        chat_texts = texts.setdefault(chat_id, [])
+        joined = chat_texts and chat_texts[-1] + MESSAGE_SEPARATOR + message
+        if joined and len(joined) <= limit:
+            chat_texts[-1] = joined
+        else:
+            chat_texts.append(message)
+    return [
+        (chat_id, text) for chat_id, chat_texts in texts.items() for text in chat_texts
+    ]
 
 
 def send_telegram_message(chat_id, message):
@@ -20,10 +80,281 @@ def send_telegram_message(chat_id, message):
     }
     try:
         response = requests.post(
-            f"{TELEGRAM_URL}{BOT_TOKEN}/sendMessage", params=params
+            f"{TELEGRAM_URL}{BOT_TOKEN}/sendMessage",
+            params=params,
+            timeout=TELEGRAM_TIMEOUT,
         )
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
         print(f"Ошибка при отправке сообщения: {e}")
         return None
+
+
+class TelegramRetryAfter(Exception):
+    """
+    Telegram ответил 429 Too Many Requests.
+
+    Attributes:
+        retry_after (float): Сколько секунд нужно подождать перед повтором
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too Many Requests: retry after {retry_after}")
+        self.retry_after = retry_after
+
+
+class TelegramClient:
+    """
+    Асинхронный клиент Telegram Bot API.
+
+    Держит пул постоянных HTTP-соединений на время жизни клиента, ограничивает
+    число одновременных запросов и время ожидания каждого из них.
+    Используется как асинхронный контекстный менеджер.
+
+    Attributes:
+        url (str): Адрес метода sendMessage
+        max_connections (int): Максимум одновременных запросов и соединений в пуле
+        timeout (float): Таймаут одного запроса в секундах
+    """
+
+    def __init__(
+        self,
+        base_url=TELEGRAM_URL,
+        token=BOT_TOKEN,
+        max_connections=TELEGRAM_MAX_CONNECTIONS,
+        timeout=TELEGRAM_TIMEOUT,
+    ):
+        self.url = f"{base_url}{token}/sendMessage"
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=self.timeout,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    async def request(self, chat_id, message):
+        """
+        Отправляет одно сообщение, не перехватывая ошибки.
+
+        Args:
+            chat_id (str): ID чата в Telegram
+            message (str): Текст сообщения
+
+        Returns:
+            dict: Ответ от Telegram API
+
+        Raises:
+            TelegramRetryAfter: Если Telegram ограничил частоту отправки (429)
+            httpx.HTTPError: При сетевой ошибке, таймауте или ошибочном статусе ответа
+        """
+        params = {
+            "text": message,
+            "chat_id": chat_id,
+        }
+        async with self._semaphore:
+            response = await self._client.post(self.url, params=params)
+        if response.status_code == 429:
+            try:
+                retry_after = response.json()["parameters"]["retry_after"]
+            except (ValueError, KeyError, TypeError):
+                retry_after = 1
+            raise TelegramRetryAfter(retry_after)
+        response.raise_for_status()
+        return response.json()
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты по алгоритму token bucket.
+
+    Attributes:
+        rate (float): Скорость пополнения (токенов в секунду)
+        capacity (float): Вместимость корзины (допустимый всплеск)
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated_at = None
+        self._paused_until = 0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        """Запрещает выдачу токенов на seconds секунд (например, по retry_after)."""
+        loop_time = asyncio.get_running_loop().time()
+        self._paused_until = max(self._paused_until, loop_time + seconds)
+
+    async def acquire(self):
+        """Дожидается и забирает один токен."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                now = loop.time()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self._updated_at is not None:
+                    elapsed = now - self._updated_at
+                    self._tokens = min(
+                        self.capacity, self._tokens + elapsed * self.rate
+                    )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class OutboundQueue:
+    """
+    Очередь исходящих сообщений Telegram с учетом лимитов отправки.
+
+    Сообщения разбирают воркеры (по числу соединений клиента). Перед каждой
+    попыткой берется токен из общей корзины и из корзины чата. Ответ 429
+    приостанавливает общую корзину на retry_after, сетевые ошибки и ответы 5xx
+    повторяются с экспоненциальной задержкой. Сообщения, не отправленные за
+    max_attempts попыток или отклоненные Telegram (4xx), попадают в dead_letters.
+
+    Лимиты действуют в пределах одной очереди: при параллельной отправке
+    несколькими очередями общий лимит нужно делить между ними
+    (см. users.tasks.send_reminders_chunk).
+
+    Attributes:
+        client (TelegramClient): Открытый клиент Telegram
+        global_rate (float): Общий лимит отправки (сообщений в секунду)
+        chat_rate (float): Лимит отправки в один чат (сообщений в секунду)
+        max_attempts (int): Максимум попыток отправки одного сообщения
+        backoff (float): Базовая задержка перед повтором в секундах
+        dead_letters (list): Неотправленные сообщения (FailedMessage, еще не сохраненные)
+    """
+
+    def __init__(
+        self,
+        client,
+        global_rate=TELEGRAM_GLOBAL_RATE,
+        chat_rate=TELEGRAM_CHAT_RATE,
+        max_attempts=TELEGRAM_MAX_ATTEMPTS,
+        backoff=TELEGRAM_RETRY_BACKOFF,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts должен быть не меньше 1")
+        self.client = client
+        self.chat_rate = chat_rate
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.dead_letters = []
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets = {}
+
+    def _get_chat_bucket(self, chat_id):
+        """Возвращает корзину токенов чата."""
+        if chat_id not in self._chat_buckets:
+            self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, capacity=1)
+        return self._chat_buckets[chat_id]
+
+    async def _backoff(self, attempt):
+        """Ждет перед повтором, если попытка attempt не последняя."""
+        if attempt < self.max_attempts:
+            await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+
+    async def deliver(self, chat_id, message):
+        """
+        Отправляет сообщение с соблюдением лимитов и повторами.
+
+        Args:
+            chat_id (str): ID чата в Telegram
+            message (str): Текст сообщения
+
+        Returns:
+            dict: Ответ от Telegram API или None, если сообщение ушло в dead_letters
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            await self._get_chat_bucket(chat_id).acquire()
+            await self._global_bucket.acquire()
+            try:
+                return await self.client.request(chat_id, message)
+            except TelegramRetryAfter as e:
+                error = e
+                self._global_bucket.pause(e.retry_after)
+            except httpx.HTTPStatusError as e:
+                error = e
+                if e.response.status_code < 500:
+                    break
+                await self._backoff(attempt)
+            except httpx.HTTPError as e:
+                error = e
+                await self._backoff(attempt)
+
+        logger.warning(
+            "Сообщение не отправлено после %s попыток: %r", attempt, error
+        )
+        self.dead_letters.append(
+            FailedMessage(
+                chat_id=chat_id, message=message, attempts=attempt, error=repr(error)
+            )
+        )
+        return None
+
+    async def send_batch(self, messages):
+        """
+        Отправляет пачку сообщений через очередь.
+
+        Args:
+            messages (list): Пары (chat_id, текст сообщения)
+
+        Returns:
+            list: Ответы Telegram API (None для неотправленных) в порядке messages
+        """
+        queue = asyncio.Queue()
+        for index, (chat_id, message) in enumerate(messages):
+            queue.put_nowait((index, chat_id, message))
+        results = [None] * len(messages)
+
+        async def worker():
+            while not queue.empty():
+                index, chat_id, message = queue.get_nowait()
+                results[index] = await self.deliver(chat_id, message)
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.client.max_connections, len(messages))))
+        )
+        return results
+
+
+def send_telegram_messages(messages, queue_options=None, **client_options):
+    """
+    Отправляет пачку сообщений в Telegram через очередь OutboundQueue.
+
+    Сообщения, которые не удалось отправить, сохраняются в FailedMessage.
+
+    Args:
+        messages (list): Пары (chat_id, текст сообщения)
+        queue_options (dict): Параметры OutboundQueue (лимиты, число попыток, задержка)
+        **client_options: Параметры TelegramClient (base_url, token, max_connections, timeout)
+
+    Returns:
+        list: Ответы Telegram API (None для неотправленных) в порядке messages
+    """
+
+    async def send():
+        async with TelegramClient(**client_options) as client:
+            outbound = OutboundQueue(client, **(queue_options or {}))
+            return await outbound.send_batch(messages), outbound.dead_letters
+
+    results, dead_letters = asyncio.run(send())
+    FailedMessage.objects.bulk_create(dead_letters)
+    return results
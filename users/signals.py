@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.authentication import invalidate_user_cache
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache_on_change(sender, instance, **kwargs):
+    """
+    Удаляет пользователя из кеша аутентификации при его изменении или удалении.
+
+    Args:
+        sender (type): Модель User
+        instance (User): Сохраненный или удаленный пользователь
+    """
+    invalidate_user_cache(instance.pk)
@@ -1,8 +1,31 @@
-from celery import shared_task
+import logging
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from celery import chord, shared_task
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
-from habits.models import Habit
-from users.services import send_telegram_message
+from habits.models import Habit, ReminderDelivery
+from habits.services import get_next_reminder_at, get_unit_period
+from users.services import (coalesce_messages, format_reminder_message,
+                            send_telegram_messages)
+
+logger = logging.getLogger(__name__)
+
+REMINDER_FIELDS = (
+    "id",
+    "action",
+    "habit_time",
+    "place",
+    "time_to_complete",
+    "next_reminder_at",
+    "periodicity__value",
+    "periodicity__unit",
+    "creator__tg_chat_id",
+    "creator__timezone",
+)
 
 
 @shared_task
@@ -10,28 +33,182 @@ def check_habits_and_send_reminders():
     """
     Периодическая задача для проверки и отправки напоминаний о привычках.
 
-    Проверяет привычки, которые должны быть выполнены в текущее время,
-    и отправляет уведомления в Telegram.
+    Обрабатывает все наступившие к текущему моменту напоминания пачками по
+    REMINDER_BATCH_SIZE привычек и раздает отправку уведомлений в Telegram
+    параллельным подзадачам. Пропущенные запуски (простой beat или воркера)
+    догоняются: по каждой привычке отправляется одно напоминание о последнем
+    наступлении. Параллельные запуски не дублируют отправку. Водяным знаком
+    служит next_reminder_at каждой привычки: он сдвигается в той же транзакции,
+    что и запись ReminderDelivery, поэтому прерванный запуск продолжится
+    со следующей необработанной привычки.
+
+    Отправка пачки ставится в очередь до фиксации ее транзакции: при ошибке
+    брокера пачка откатывается и будет обработана следующим запуском.
+    Доставка - не реже одного раза: повтор возможен, только если транзакция
+    не зафиксировалась уже после постановки отправки в очередь.
 
     Логика:
-    1. Получает текущее время (с учетом часового пояса)
-    2. Находит привычки, запланированные на это время
-    3. Для каждой привычки отправляет напоминание в Telegram
+    1. Получает текущее время
+    2. В отдельной транзакции блокирует очередную пачку наступивших привычек
+       (SKIP LOCKED - параллельный запуск возьмет другие привычки)
+    3. Записывает ReminderDelivery по (привычка, наступление), пропуская уже
+       записанные, и сдвигает next_reminder_at одним bulk_update
+    4. В той же транзакции ставит отправку напоминаний пачки в очередь
+       (dispatch_reminders)
+    5. Повторяет, пока наступившие привычки не закончатся
+
+    Returns:
+        int: Количество запущенных пачек отправки
     """
     now = timezone.now()
-    current_time = now.time()
 
-    habits = Habit.objects.filter(
-        habit_time__hour=current_time.hour + 3,
-        habit_time__minute=current_time.minute,
-        creator__isnull=False,
-    )
+    chunks = 0
+    while True:
+        with transaction.atomic():
+            habits = list(
+                Habit.objects.due(now)
+                .order_by("next_reminder_at", "id")
+                .select_for_update(skip_locked=True, of=("self",))
+                .values(*REMINDER_FIELDS)[: settings.REMINDER_BATCH_SIZE]
+            )
+            reminders = process_reminders_batch(habits, now)
+            chunks += dispatch_reminders(reminders)
+        if not habits:
+            break
+    return chunks
+
+
+def process_reminders_batch(habits, now):
+    """
+    Фиксирует отправку напоминаний по пачке наступивших привычек.
+
+    Args:
+        habits (list): Строки привычек с полями REMINDER_FIELDS
+        now (datetime): Текущий момент (конец обрабатываемого окна)
 
+    Returns:
+        list: Пары (tg_chat_id, текст сообщения) для еще не отправленных наступлений
+    """
+    deliveries = []
+    advanced = []
     for habit in habits:
-        if habit.creator.tg_chat_id:
-            message = (
-                f"Напоминание о привычке:\n"
-                f"Я должен {habit.action} в {habit.habit_time}. Место выполнения: {habit.place}\n"
-                f"Время на выполнение: {habit.time_to_complete} секунд"
+        period = get_unit_period(
+            habit["periodicity__value"], habit["periodicity__unit"]
+        )
+        next_reminder_at = get_next_reminder_at(
+            habit["next_reminder_at"], period, now, ZoneInfo(habit["creator__timezone"])
+        )
+        deliveries.append(
+            ReminderDelivery(habit_id=habit["id"], occurrence=next_reminder_at - period)
+        )
+        advanced.append(Habit(id=habit["id"], next_reminder_at=next_reminder_at))
+    if not habits:
+        return []
+
+    delivered = set(
+        ReminderDelivery.objects.filter(
+            habit_id__in=[delivery.habit_id for delivery in deliveries],
+            occurrence__in={delivery.occurrence for delivery in deliveries},
+        ).values_list("habit_id", "occurrence")
+    )
+    reminders = []
+    new_deliveries = []
+    for habit, delivery in zip(habits, deliveries):
+        if (delivery.habit_id, delivery.occurrence) in delivered:
+            continue
+        new_deliveries.append(delivery)
+        if habit["creator__tg_chat_id"]:
+            reminders.append(
+                (habit["creator__tg_chat_id"], format_reminder_message(habit))
             )
-            send_telegram_message(habit.creator.tg_chat_id, message)
+
+    ReminderDelivery.objects.bulk_create(new_deliveries, ignore_conflicts=True)
+    Habit.objects.bulk_update(advanced, ["next_reminder_at"])
+    return reminders
+
+
+def dispatch_reminders(reminders):
+    """
+    Раздает отправку напоминаний подзадачам send_reminders_chunk.
+
+    При REMINDER_COALESCE объединяет напоминания в один чат в одно сообщение,
+    затем делит их на пачки по REMINDER_CHUNK_SIZE. Пачки отправляются
+    параллельно, поэтому общий лимит TELEGRAM_GLOBAL_RATE делится между ними
+    поровну. Итог собирает report_reminders_results.
+
+    Args:
+        reminders (list): Пары (tg_chat_id, текст сообщения)
+
+    Returns:
+        int: Количество запущенных пачек
+    """
+    if settings.REMINDER_COALESCE:
+        reminders = coalesce_messages(reminders)
+    chunk_size = settings.REMINDER_CHUNK_SIZE
+    chunks = [
+        reminders[i : i + chunk_size] for i in range(0, len(reminders), chunk_size)
+    ]
+    if chunks:
+        chord(send_reminders_chunk.s(chunk, len(chunks)) for chunk in chunks)(
+            report_reminders_results.s()
+        )
+    return len(chunks)
+
+
+@shared_task
+def cleanup_reminder_deliveries():
+    """
+    Периодическая задача удаления устаревших записей об отправке напоминаний.
+
+    Записи старше REMINDER_DELIVERY_RETENTION_DAYS дней больше не нужны
+    для защиты от повторной отправки.
+
+    Returns:
+        int: Количество удаленных записей
+    """
+    border = timezone.now() - timedelta(days=settings.REMINDER_DELIVERY_RETENTION_DAYS)
+    deleted, _ = ReminderDelivery.objects.filter(occurrence__lt=border).delete()
+    return deleted
+
+
+@shared_task
+def send_reminders_chunk(reminders, chunks=1):
+    """
+    Конкурентно отправляет пачку напоминаний в Telegram.
+
+    Пачка получает долю общего лимита отправки TELEGRAM_GLOBAL_RATE / chunks.
+    Лимит на чат соблюдается в пределах пачки: без REMINDER_COALESCE
+    напоминания одного чата могут попасть в разные пачки.
+
+    Args:
+        reminders (list): Пары (tg_chat_id, текст сообщения)
+        chunks (int): Количество пачек, отправляемых параллельно
+
+    Returns:
+        dict: Количество отправленных (sent) и неотправленных (failed) сообщений
+    """
+    results = send_telegram_messages(
+        reminders, queue_options={"global_rate": settings.TELEGRAM_GLOBAL_RATE / chunks}
+    )
+    sent = sum(result is not None for result in results)
+    return {"sent": sent, "failed": len(reminders) - sent}
+
+
+@shared_task
+def report_reminders_results(results):
+    """
+    Сводит результаты отправки всех пачек одного запуска планировщика.
+
+    Args:
+        results (list): Результаты send_reminders_chunk по каждой пачке
+
+    Returns:
+        dict: Количество пачек (chunks), отправленных (sent) и неотправленных (failed) сообщений
+    """
+    report = {
+        "chunks": len(results),
+        "sent": sum(result["sent"] for result in results),
+        "failed": sum(result["failed"] for result in results),
+    }
+    logger.info("Напоминания отправлены: %s", report)
+    return report
@@ -1,18 +1,45 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
 from unittest import TestCase
 from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 import requests
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from config.celery import app as celery_app
+from config.metrics import install as install_metrics
+from config.metrics import registry as metrics_registry
 from config.settings import BOT_TOKEN
-from habits.models import Habit
-from users.models import User
-from users.services import send_telegram_message
-from users.tasks import check_habits_and_send_reminders
+from habits.constans import ERROR_MESSAGES as HABIT_ERROR_MESSAGES
+from habits.models import Habit, Periodicity, ReminderDelivery
+from users.constans import ERROR_MESSAGES
+from users.loadtest import split_requests
+from users.checks import check_revoked_tokens_cache
+from users.models import FailedMessage, User
+from users.services import send_telegram_message, send_telegram_messages
+from users.tasks import (check_habits_and_send_reminders,
+                         cleanup_reminder_deliveries, report_reminders_results,
+                         send_reminders_chunk)
+from users.tokens import is_token_revoked, revoke_token
 
 
 class UserAPITestCase(APITestCase):
@@ -37,6 +64,24 @@ class UserAPITestCase(APITestCase):
         self.assertTrue(created_user.check_password(data["password"]))
         self.assertTrue(created_user.is_active)
 
+    def test_user_create_timezone(self):
+        """Тест указания часового пояса при регистрации."""
+        url = reverse("users:register")
+        data = {
+            "email": "newuser@mail.com",
+            "password": "new_password_123",
+            "timezone": "Asia/Yekaterinburg",
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["timezone"], "Asia/Yekaterinburg")
+        self.assertEqual(self.user.timezone, "Europe/Moscow")
+
+        data["timezone"] = "Mars/Olympus"
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(ERROR_MESSAGES[0], response.json()["timezone"])
+
     def test_user_create_missing_fields(self):
         """Тест создания пользователя с неполными данными."""
         url = reverse("users:register")
@@ -121,8 +166,132 @@ class TelegramUtilsTestCase(APITestCase):
         self.assertIsNone(result)
 
 
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    """Локальная заглушка метода sendMessage Telegram Bot API."""
+
+    hits = Counter()
+
+    def do_POST(self):
+        chat_id = parse_qs(urlparse(self.path).query)["chat_id"][0]
+        self.hits[chat_id] += 1
+        if chat_id == "slow":
+            time.sleep(0.5)
+        status_code = 200
+        if chat_id == "bad":
+            status_code = 400
+        elif chat_id == "down":
+            status_code = 500
+        elif chat_id == "limited" and self.hits[chat_id] == 1:
+            status_code = 429
+        body = json.dumps(
+            {
+                "ok": status_code == 200,
+                "result": {"chat": chat_id},
+                "parameters": {"retry_after": 0.2},
+            }
+        )
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class TelegramClientTestCase(APITestCase):
+    def setUp(self):
+        FakeTelegramHandler.hits.clear()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTelegramHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/bot"
+
+    def test_send_batch(self):
+        """Тест конкурентной отправки пачки сообщений через локальный сервер."""
+        messages = [(str(i), f"Сообщение {i}") for i in range(20)] + [("bad", "x")]
+
+        results = send_telegram_messages(
+            messages, base_url=self.base_url, token="token", max_connections=5
+        )
+
+        self.assertEqual(len(results), 21)
+        self.assertEqual(results[3]["result"], {"chat": "3"})
+        self.assertIsNone(results[-1])
+        self.assertEqual(FakeTelegramHandler.hits["bad"], 1)
+
+    def test_send_batch_timeout(self):
+        """Тест таймаута отдельного запроса."""
+        results = send_telegram_messages(
+            [("slow", "x"), ("1", "y")],
+            base_url=self.base_url,
+            token="token",
+            timeout=0.1,
+            queue_options={"max_attempts": 1},
+        )
+
+        self.assertIsNone(results[0])
+        self.assertIsNotNone(results[1])
+
+    def test_retry_after(self):
+        """Тест повтора отправки после ответа 429 с учетом retry_after."""
+        started_at = time.monotonic()
+
+        results = send_telegram_messages(
+            [("limited", "x")], base_url=self.base_url, token="token"
+        )
+
+        self.assertIsNotNone(results[0])
+        self.assertEqual(FakeTelegramHandler.hits["limited"], 2)
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.2)
+
+    def test_dead_letter(self):
+        """Тест сохранения сообщения в dead-letter после исчерпания попыток."""
+        results = send_telegram_messages(
+            [("down", "Сообщение")],
+            base_url=self.base_url,
+            token="token",
+            queue_options={"max_attempts": 3, "backoff": 0.01},
+        )
+
+        self.assertEqual(results, [None])
+        self.assertEqual(FakeTelegramHandler.hits["down"], 3)
+        failed = FailedMessage.objects.get()
+        self.assertEqual(failed.chat_id, "down")
+        self.assertEqual(failed.attempts, 3)
+
+    def test_invalid_max_attempts(self):
+        """Тест отказа создавать очередь без попыток отправки."""
+        with self.assertRaises(ValueError):
+            send_telegram_messages(
+                [("1", "x")],
+                base_url=self.base_url,
+                token="token",
+                queue_options={"max_attempts": 0},
+            )
+        self.assertEqual(FakeTelegramHandler.hits["1"], 0)
+
+    def test_chat_rate_limit(self):
+        """Тест ограничения частоты отправки в один чат."""
+        started_at = time.monotonic()
+
+        send_telegram_messages(
+            [("1", "a"), ("1", "b"), ("1", "c"), ("2", "d")],
+            base_url=self.base_url,
+            token="token",
+            queue_options={"chat_rate": 10},
+        )
+
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.2)
+        self.assertEqual(FakeTelegramHandler.hits["1"], 3)
+
+
 class HabitTasksTestCase(APITestCase):
     def setUp(self):
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
         self.user = User.objects.create(email="testuser@mail.com", tg_chat_id="123456")
         self.habit = Habit.objects.create(
             creator=self.user,
@@ -133,10 +302,11 @@ class HabitTasksTestCase(APITestCase):
         )
 
     @patch("users.tasks.timezone.now")
-    @patch("users.tasks.send_telegram_message")
+    @patch("users.tasks.send_telegram_messages")
     def test_check_habits_and_send_reminders_success(self, mock_send, mock_now):
         """Тест успешной отправки напоминания о привычке."""
-        mock_now.return_value = timezone.datetime(2025, 1, 1, 9, 0)
+        reminder_at = self.habit.next_reminder_at
+        mock_now.return_value = reminder_at
 
         check_habits_and_send_reminders()
 
@@ -145,29 +315,254 @@ class HabitTasksTestCase(APITestCase):
             "Я должен Тестовое действие в 12:00:00. Место выполнения: Тестовое место\n"
             "Время на выполнение: 60 секунд"
         )
-        mock_send.assert_called_once_with("123456", expected_message)
+        mock_send.assert_called_once_with(
+            [("123456", expected_message)],
+            queue_options={"global_rate": settings.TELEGRAM_GLOBAL_RATE},
+        )
+        self.habit.refresh_from_db()
+        self.assertEqual(self.habit.next_reminder_at, reminder_at + timedelta(days=1))
 
     @patch("users.tasks.timezone.now")
-    @patch("users.tasks.send_telegram_message")
+    @patch("users.tasks.send_telegram_messages")
     def test_check_habits_no_matching_time(self, mock_send, mock_now):
         """Тест отсутствия привычек для текущего времени."""
-        mock_now.return_value = timezone.datetime(2023, 1, 1, 10, 0)
+        mock_now.return_value = self.habit.next_reminder_at - timedelta(minutes=1)
 
         check_habits_and_send_reminders()
 
         mock_send.assert_not_called()
 
     @patch("users.tasks.timezone.now")
-    @patch("users.tasks.send_telegram_message")
+    @patch("users.tasks.send_telegram_messages")
     def test_check_habits_no_tg_chat_id(self, mock_send, mock_now):
         """Тест отсутствия tg_chat_id у пользователя."""
         self.user.tg_chat_id = None
         self.user.save()
-        mock_now.return_value = timezone.datetime(2023, 1, 1, 9, 0)
+        reminder_at = self.habit.next_reminder_at
+        mock_now.return_value = reminder_at
 
         check_habits_and_send_reminders()
 
         mock_send.assert_not_called()
+        self.habit.refresh_from_db()
+        self.assertGreater(self.habit.next_reminder_at, reminder_at)
+
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_uses_periodicity(self, mock_send):
+        """Тест сдвига напоминания на период привычки."""
+        self.habit.periodicity = Periodicity.objects.create(value=1, unit="week")
+        self.habit.save()
+        reminder_at = self.habit.next_reminder_at
+
+        with patch("users.tasks.timezone.now", return_value=reminder_at):
+            check_habits_and_send_reminders()
+
+        mock_send.assert_called_once()
+        self.habit.refresh_from_db()
+        self.assertEqual(self.habit.next_reminder_at, reminder_at + timedelta(weeks=1))
+
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_query_count(self, mock_send):
+        """Тест постоянного числа запросов независимо от числа наступивших привычек."""
+        for i in range(5):
+            user = User.objects.create(
+                email=f"user{i}@mail.com", tg_chat_id=str(i) if i % 2 else None
+            )
+            Habit.objects.create(
+                creator=user,
+                action=f"Действие {i}",
+                place="Тестовое место",
+                habit_time="12:00:00",
+                time_to_complete=60,
+                periodicity=Periodicity.objects.create(value=i + 1, unit="hours"),
+            )
+        reminder_at = Habit.objects.order_by("-next_reminder_at")[0].next_reminder_at
+
+        with patch("users.tasks.timezone.now", return_value=reminder_at):
+            # Пачка: выборка, проверка отправок, запись отправок, сдвиг расписания;
+            # пустая выборка; по SAVEPOINT/RELEASE на каждую транзакцию.
+            with self.assertNumQueries(9):
+                check_habits_and_send_reminders()
+
+        mock_send.assert_called_once()
+        self.assertEqual(len(mock_send.call_args[0][0]), 3)
+        self.assertFalse(Habit.objects.due(reminder_at).exists())
+
+    @override_settings(REMINDER_CHUNK_SIZE=2)
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_chunks(self, mock_send):
+        """Тест раздачи напоминаний пачками заданного размера."""
+        mock_send.side_effect = lambda messages, **kwargs: [{"ok": True}] * len(
+            messages
+        )
+        for i in range(4):
+            Habit.objects.create(
+                creator=self.user,
+                action=f"Действие {i}",
+                place="Тестовое место",
+                habit_time="12:00:00",
+                time_to_complete=60,
+            )
+
+        with patch(
+            "users.tasks.timezone.now", return_value=self.habit.next_reminder_at
+        ):
+            chunks = check_habits_and_send_reminders()
+
+        self.assertEqual(chunks, 3)
+        self.assertEqual(mock_send.call_count, 3)
+        self.assertEqual(sum(len(call[0][0]) for call in mock_send.call_args_list), 5)
+        for call in mock_send.call_args_list:
+            self.assertAlmostEqual(
+                call.kwargs["queue_options"]["global_rate"],
+                settings.TELEGRAM_GLOBAL_RATE / 3,
+            )
+
+    @patch("users.tasks.send_telegram_messages")
+    def test_send_reminders_chunk(self, mock_send):
+        """Тест отчета об отправке пачки и сводного отчета."""
+        mock_send.return_value = [{"ok": True}, None, {"ok": True}]
+
+        result = send_reminders_chunk([("1", "a"), ("2", "b"), ("3", "c")])
+
+        self.assertEqual(result, {"sent": 2, "failed": 1})
+        self.assertEqual(
+            report_reminders_results([result, {"sent": 1, "failed": 0}]),
+            {"chunks": 2, "sent": 3, "failed": 1},
+        )
+
+    @override_settings(REMINDER_COALESCE=True)
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_coalesce(self, mock_send):
+        """Тест объединения напоминаний одного чата в одно сообщение."""
+        Habit.objects.create(
+            creator=self.user,
+            action="Второе действие",
+            place="Тестовое место",
+            habit_time="12:00:00",
+            time_to_complete=30,
+        )
+
+        with patch(
+            "users.tasks.timezone.now", return_value=self.habit.next_reminder_at
+        ):
+            check_habits_and_send_reminders()
+
+        messages = mock_send.call_args[0][0]
+        self.assertEqual(len(messages), 1)
+        chat_id, message = messages[0]
+        self.assertEqual(chat_id, "123456")
+        self.assertIn("Я должен Тестовое действие в 12:00:00", message)
+        self.assertIn("Я должен Второе действие в 12:00:00", message)
+        self.assertEqual(message.count("Напоминание о привычке"), 2)
+
+    @override_settings(REMINDER_COALESCE=True)
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_coalesce_message_limit(self, mock_send):
+        """Тест деления объединенного сообщения по лимиту длины Telegram."""
+        for i in range(30):
+            Habit.objects.create(
+                creator=self.user,
+                action=f"Действие {i} " + "x" * 180,
+                place="Тестовое место",
+                habit_time="12:00:00",
+                time_to_complete=60,
+            )
+
+        with patch(
+            "users.tasks.timezone.now", return_value=self.habit.next_reminder_at
+        ):
+            check_habits_and_send_reminders()
+
+        messages = mock_send.call_args[0][0]
+        self.assertGreater(len(messages), 1)
+        self.assertTrue(all(chat_id == "123456" for chat_id, _ in messages))
+        self.assertTrue(all(len(message) <= 4096 for _, message in messages))
+        self.assertEqual(
+            sum(message.count("Напоминание о привычке") for _, message in messages), 31
+        )
+
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_catch_up(self, mock_send):
+        """Тест догоняющей отправки после пропущенных запусков."""
+        reminder_at = self.habit.next_reminder_at
+        now = reminder_at + timedelta(days=3, minutes=5)
+
+        with patch("users.tasks.timezone.now", return_value=now):
+            check_habits_and_send_reminders()
+
+        mock_send.assert_called_once()
+        self.assertEqual(len(mock_send.call_args[0][0]), 1)
+        self.assertTrue(
+            ReminderDelivery.objects.filter(
+                habit=self.habit, occurrence=reminder_at + timedelta(days=3)
+            ).exists()
+        )
+        self.habit.refresh_from_db()
+        self.assertEqual(self.habit.next_reminder_at, reminder_at + timedelta(days=4))
+
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_exactly_once(self, mock_send):
+        """Тест пропуска уже отправленного наступления."""
+        reminder_at = self.habit.next_reminder_at
+        ReminderDelivery.objects.create(habit=self.habit, occurrence=reminder_at)
+
+        with patch("users.tasks.timezone.now", return_value=reminder_at):
+            chunks = check_habits_and_send_reminders()
+
+        self.assertEqual(chunks, 0)
+        mock_send.assert_not_called()
+        self.habit.refresh_from_db()
+        self.assertGreater(self.habit.next_reminder_at, reminder_at)
+
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_dispatch_error(self, mock_send):
+        """Тест повторной обработки пачки, отправку которой не удалось поставить в очередь."""
+        reminder_at = self.habit.next_reminder_at
+
+        with patch("users.tasks.timezone.now", return_value=reminder_at):
+            with patch("users.tasks.chord", side_effect=ConnectionError):
+                with self.assertRaises(ConnectionError):
+                    check_habits_and_send_reminders()
+            self.assertFalse(ReminderDelivery.objects.exists())
+            self.habit.refresh_from_db()
+            self.assertEqual(self.habit.next_reminder_at, reminder_at)
+
+            check_habits_and_send_reminders()
+
+        mock_send.assert_called_once()
+        self.assertEqual(ReminderDelivery.objects.count(), 1)
+
+    @override_settings(REMINDER_BATCH_SIZE=2)
+    @patch("users.tasks.send_telegram_messages")
+    def test_check_habits_batches(self, mock_send):
+        """Тест обработки наступивших привычек ограниченными пачками."""
+        for i in range(4):
+            Habit.objects.create(
+                creator=self.user,
+                action=f"Действие {i}",
+                place="Тестовое место",
+                habit_time="12:00:00",
+                time_to_complete=60,
+            )
+
+        with patch(
+            "users.tasks.timezone.now", return_value=self.habit.next_reminder_at
+        ):
+            chunks = check_habits_and_send_reminders()
+
+        self.assertEqual(chunks, 3)
+        self.assertEqual(ReminderDelivery.objects.count(), 5)
+
+    def test_cleanup_reminder_deliveries(self):
+        """Тест удаления устаревших записей об отправке."""
+        ReminderDelivery.objects.create(
+            habit=self.habit, occurrence=timezone.now() - timedelta(days=30)
+        )
+        ReminderDelivery.objects.create(habit=self.habit, occurrence=timezone.now())
+
+        self.assertEqual(cleanup_reminder_deliveries(), 1)
+        self.assertEqual(ReminderDelivery.objects.count(), 1)
 
 
 class CreateSuperuserCommandTestCase(TestCase):
@@ -183,3 +578,488 @@ class CreateSuperuserCommandTestCase(TestCase):
         self.assertTrue(user.is_superuser)
 
         self.assertTrue(user.check_password("12345qwerty"))
+
+
+class BenchRemindersCommandTestCase(APITestCase):
+    def test_bench_reminders_command(self):
+        """Тест замера рассылки напоминаний на синтетических данных."""
+        users_count = User.objects.count()
+        output = StringIO()
+
+        call_command("bench_reminders", users=5, habits=20, stdout=output)
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["benchmark"], "reminders")
+        self.assertEqual(report["results"]["habits_due"], 20)
+        self.assertGreater(report["results"]["messages"], 0)
+        self.assertGreater(report["results"]["queries"], 0)
+        self.assertEqual(User.objects.count(), users_count)
+
+    def test_bench_serializers_command(self):
+        """Тест сравнения путей чтения списков привычек на синтетических данных."""
+        output = StringIO()
+
+        call_command(
+            "bench_serializers", users=2, habits=10, sizes=[5], repeat=1, stdout=output
+        )
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["benchmark"], "serializers")
+        self.assertEqual(
+            set(report["results"]["5"]), {"serializer_ms", "values_ms", "speedup"}
+        )
+        self.assertFalse(Habit.objects.exists())
+
+
+class BenchHashersCommandTestCase(APITestCase):
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_bench_hashers_command(self):
+        """Тест замера проверки паролей разными алгоритмами."""
+        output = StringIO()
+
+        call_command("bench_hashers", repeat=1, stdout=output)
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["benchmark"], "hashers")
+        self.assertEqual(set(report["results"]), {"argon2", "scrypt", "pbkdf2"})
+        self.assertEqual(report["results"]["pbkdf2"]["params"], {"iterations": 1000})
+        self.assertEqual(report["results"]["pbkdf2"]["speedup"], 1.0)
+
+
+class LoadtestCommandTestCase(APITestCase):
+    def test_loadtest_command(self):
+        """Тест нагрузки внутри процесса и сравнения с предыдущим отчетом."""
+        users_before = User.objects.count()
+        with tempfile.TemporaryDirectory() as directory:
+            base_path = os.path.join(directory, "base.json")
+            call_command(
+                "loadtest", requests=60, users=3, output=base_path, stdout=StringIO()
+            )
+            output = StringIO()
+            call_command(
+                "loadtest", requests=60, users=3, compare=base_path, stdout=output
+            )
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["benchmark"], "loadtest")
+        self.assertEqual(report["results"]["total"]["requests"], 60)
+        self.assertEqual(report["results"]["total"]["errors"], 0)
+        self.assertEqual(
+            set(report["results"]["total"]),
+            {"requests", "errors", "p50_ms", "p95_ms", "p99_ms", "rps"},
+        )
+        self.assertIn("p95_ms", report["compare"]["diff"]["total"])
+        self.assertEqual(User.objects.count(), users_before)
+        self.assertFalse(Habit.objects.exists())
+
+    def test_split_requests(self):
+        """Тест деления запросов между потоками без потери остатка."""
+        self.assertEqual(split_requests(10, 4), [3, 3, 2, 2])
+        self.assertEqual(split_requests(3, 4), [1, 1, 1, 0])
+        self.assertEqual(split_requests(8, 4), [2, 2, 2, 2])
+
+
+class ImportHabitsCommandTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="owner@mail.com")
+        self.enjoyable_habit = Habit.objects.create(
+            creator=self.user,
+            action="Приятное действие",
+            place="Дом",
+            habit_time="08:00:00",
+            time_to_complete=30,
+            enjoyable_habit=True,
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_import_csv(self):
+        """Тест импорта CSV с проверкой правил и созданием пользователей."""
+        path = self.write_file(
+            "habits.csv",
+            "creator_email,place,habit_time,action,related_habit,reward,"
+            "time_to_complete,publicity\n"
+            f"owner@mail.com,Парк,07:00,Бег,{self.enjoyable_habit.pk},,60,true\n"
+            "new@mail.com,Дом,21:00,Чтение,,Чай,90,false\n"
+            "owner@mail.com,Дом,25:00,Зарядка,,,60,false\n"
+            "owner@mail.com,Дом,09:00,Медитация,,,121,false\n"
+            f"owner@mail.com,Дом,09:00,Душ,{self.enjoyable_habit.pk},Чай,60,false\n",
+        )
+        output = StringIO()
+        errors = StringIO()
+
+        call_command(
+            "import_habits",
+            path,
+            create_users=True,
+            batch_size=2,
+            stdout=output,
+            stderr=errors,
+        )
+
+        self.assertIn("импортировано: 2, отклонено: 3", output.getvalue())
+        rejects = [json.loads(line) for line in errors.getvalue().splitlines()]
+        self.assertEqual([reject["line"] for reject in rejects], [4, 5, 6])
+        self.assertIn("habit_time", rejects[0]["errors"])
+        self.assertEqual(
+            rejects[1]["errors"], {"non_field_errors": [HABIT_ERROR_MESSAGES[1]]}
+        )
+        self.assertEqual(
+            rejects[2]["errors"], {"non_field_errors": [HABIT_ERROR_MESSAGES[0]]}
+        )
+
+        habit = Habit.objects.get(action="Бег")
+        self.assertEqual(habit.related_habit, self.enjoyable_habit)
+        self.assertIsNotNone(habit.next_reminder_at)
+        self.assertEqual(
+            Habit.objects.get(action="Чтение").creator.email, "new@mail.com"
+        )
+
+    def test_import_exported_ndjson(self):
+        """Тест импорта выгрузки /habits/export/ в NDJSON для другого пользователя."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("habits:habits_export"))
+        path = self.write_file(
+            "habits.ndjson",
+            b"".join(response.streaming_content).decode() + "not json\n",
+        )
+        User.objects.create(email="copy@mail.com")
+        errors = StringIO()
+
+        call_command(
+            "import_habits",
+            path,
+            creator="copy@mail.com",
+            stdout=StringIO(),
+            stderr=errors,
+        )
+
+        habit = Habit.objects.get(creator__email="copy@mail.com")
+        self.assertEqual(habit.action, "Приятное действие")
+        self.assertTrue(habit.enjoyable_habit)
+        self.assertEqual(json.loads(errors.getvalue())["line"], 2)
+
+    def test_import_unknown_creator(self):
+        """Тест отклонения строк с неизвестным создателем без --create-users."""
+        path = self.write_file(
+            "habits.csv",
+            "creator_email,place,habit_time,action,time_to_complete\n"
+            "ghost@mail.com,Дом,08:00,Сон,60\n",
+        )
+        errors = StringIO()
+        call_command("import_habits", path, stdout=StringIO(), stderr=errors)
+        self.assertEqual(
+            json.loads(errors.getvalue())["errors"],
+            {"creator_email": [HABIT_ERROR_MESSAGES[13]]},
+        )
+        self.assertFalse(User.objects.filter(email="ghost@mail.com").exists())
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN="secret")
+class MetricsTestCase(APITestCase):
+    def setUp(self):
+        install_metrics()
+        metrics_registry.reset()
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.user.set_password("password")
+        self.user.save()
+
+    def get_metrics(self):
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.content.decode()
+
+    def test_server_timing(self):
+        """Тест заголовка Server-Timing и гистограмм представлений."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("habits:habits_list"))
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+        self.assertIn("serializer;dur=", response["Server-Timing"])
+        response = self.client.get(reverse("users:profile", args=(self.user.pk,)))
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.client.force_authenticate(user=None)
+        self.client.post(
+            reverse("users:login"),
+            {"email": "testuser@mail.com", "password": "password"},
+        )
+
+        metrics = self.get_metrics()
+        self.assertIn("# TYPE habits_queries histogram", metrics)
+        for name in ("habits:habits_list", "users:profile", "users:login"):
+            self.assertIn(
+                f'habits_duration_seconds_count{{kind="view",name="{name}"}} 1',
+                metrics,
+            )
+        self.assertIn(
+            'habits_queries_bucket{kind="view",name="habits:habits_list",le="1"} 1',
+            metrics,
+        )
+
+    def test_streaming_response_metrics(self):
+        """Тест замера потокового ответа после чтения его тела."""
+        Habit.objects.create(
+            creator=self.user,
+            place="Дом",
+            habit_time="12:00:00",
+            action="Читать",
+            time_to_complete=60,
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("habits:habits_export"))
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertNotIn('name="habits:habits_export"', self.get_metrics())
+
+        b"".join(response.streaming_content)
+        response.close()
+        metrics = self.get_metrics()
+        self.assertIn(
+            'habits_duration_seconds_count{kind="view",name="habits:habits_export"} 1',
+            metrics,
+        )
+        self.assertNotIn(
+            'habits_queries_sum{kind="view",name="habits:habits_export"} 0.0', metrics
+        )
+
+    def test_task_metrics(self):
+        """Тест замера задачи Celery."""
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
+
+        check_habits_and_send_reminders.delay()
+
+        self.assertIn(
+            'habits_duration_seconds_count{kind="task",'
+            'name="users.tasks.check_habits_and_send_reminders"} 1',
+            self.get_metrics(),
+        )
+
+    def test_metrics_token(self):
+        """Тест доступа к метрикам только с токеном."""
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_metrics_without_token(self):
+        """Тест недоступности метрик без настроенного токена."""
+        self.assertEqual(
+            self.client.get(reverse("metrics")).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_metrics_disabled(self):
+        """Тест отключения замеров."""
+        self.assertEqual(
+            self.client.get(reverse("metrics")).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+
+class PasswordHashingTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="testuser@mail.com")
+
+    def login(self):
+        return self.client.post(
+            reverse("users:login"),
+            {"email": "testuser@mail.com", "password": "testpassword"},
+        )
+
+    def test_register_uses_default_hasher(self):
+        """Тест хеширования пароля при регистрации основным алгоритмом."""
+        self.client.post(
+            reverse("users:register"),
+            {"email": "newuser@mail.com", "password": "new_password_123"},
+        )
+        user = User.objects.get(email="newuser@mail.com")
+        self.assertTrue(user.password.startswith("argon2$argon2id$"))
+
+    def test_rehash_on_login(self):
+        """Тест пересчета хеша другого алгоритма при входе."""
+        self.user.password = make_password("testpassword", hasher="pbkdf2_sha256")
+        self.user.save()
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("argon2$"))
+        self.assertTrue(self.user.check_password("testpassword"))
+
+    def test_rehash_on_cost_change(self):
+        """Тест пересчета хеша при изменении стоимости алгоритма."""
+        self.user.set_password("testpassword")
+        self.user.save()
+
+        with override_settings(PASSWORD_ARGON2_TIME_COST=3):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertIn("t=3", self.user.password)
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def get_habits(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("habits:habits_list"))
+        return response, len(queries)
+
+    def test_user_cached(self):
+        """Тест аутентификации без запроса пользователя к БД при повторном запросе."""
+        response, first_queries = self.get_habits()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response, queries = self.get_habits()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, first_queries - 1)
+
+    def test_cache_invalidated_on_save(self):
+        """Тест сброса кеша при изменении и удалении пользователя."""
+        self.get_habits()
+
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self.get_habits()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = True
+        self.user.save()
+        self.get_habits()
+        self.user.delete()
+        response, _ = self.get_habits()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_user_fields(self):
+        """Тест данных пользователя, собранного из кеша."""
+        self.user.timezone = "Asia/Yekaterinburg"
+        self.user.save()
+        self.get_habits()
+
+        response = self.client.post(
+            reverse("habits:habit_create"),
+            {
+                "action": "Прогулка",
+                "place": "Парк",
+                "habit_time": "08:00:00",
+                "time_to_complete": 60,
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        habit = Habit.objects.get(id=response.json()["id"])
+        self.assertEqual(habit.creator, self.user)
+        self.assertEqual(
+            timezone.localtime(habit.next_reminder_at, self.user.get_timezone()).hour,
+            8,
+        )
+
+    @override_settings(JWT_USER_CACHE_TIMEOUT=30)
+    def test_cache_timeout_capped(self):
+        """Тест хранения пользователя в кеше не дольше JWT_USER_CACHE_TIMEOUT."""
+        with patch("users.authentication.cache.set") as cache_set:
+            self.get_habits()
+
+        self.assertEqual(cache_set.call_args.kwargs["timeout"], 30)
+
+
+class TokenRevocationTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email="testuser@mail.com")
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def refresh_tokens(self, refresh):
+        return self.client.post(reverse("users:token_refresh"), {"refresh": refresh})
+
+    def test_refresh_rotation(self):
+        """Тест ротации: старый refresh-токен можно использовать только один раз."""
+        response = self.refresh_tokens(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_refresh = response.json()["refresh"]
+        self.assertNotEqual(new_refresh, self.refresh)
+
+        response = self.refresh_tokens(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+
+        self.assertEqual(
+            self.refresh_tokens(new_refresh).status_code, status.HTTP_200_OK
+        )
+
+    def test_refresh_inactive_user(self):
+        """Тест отказа в обновлении токенов неактивному пользователю."""
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.refresh_tokens(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout(self):
+        """Тест отзыва refresh-токена при выходе."""
+        response = self.client.post(reverse("users:logout"), {"refresh": self.refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.refresh_tokens(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_invalid_token(self):
+        """Тест выхода с недействительным токеном."""
+        response = self.client.post(reverse("users:logout"), {"refresh": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_expires_with_token(self):
+        """Тест хранения отзыва не дольше срока действия токена."""
+        token = RefreshToken(self.refresh)
+        self.assertTrue(revoke_token(token))
+        self.assertFalse(revoke_token(token))
+        self.assertTrue(is_token_revoked(token))
+
+        with patch("users.tokens.cache.add") as cache_add:
+            revoke_token(token)
+        self.assertLessEqual(
+            cache_add.call_args.kwargs["timeout"],
+            settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds(),
+        )
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+    )
+    def test_process_local_cache_check(self):
+        """Тест запрета хранить отзывы в кеше процесса при ротации токенов."""
+        errors = check_revoked_tokens_cache(None)
+        self.assertEqual([error.id for error in errors], ["users.E001"])
+
+        with override_settings(
+            SIMPLE_JWT={**settings.SIMPLE_JWT, "ROTATE_REFRESH_TOKENS": False}
+        ):
+            self.assertEqual(check_revoked_tokens_cache(None), [])
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379/0",
+            }
+        }
+    )
+    def test_shared_cache_check(self):
+        """Тест проверки общего кеша отозванных токенов."""
+        self.assertEqual(check_revoked_tokens_cache(None), [])
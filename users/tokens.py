@@ -0,0 +1,40 @@
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+REVOKED_TOKEN_KEY = "revoked:{}"
+
+
+def revoke_token(token):
+    """
+    Отзывает токен до истечения его срока действия.
+
+    Отзыв хранится в общем кеше (CACHE_URL, см. проверку users.E001) ровно
+    столько, сколько живет токен, поэтому размер хранилища ограничен
+    количеством действующих токенов.
+
+    Args:
+        token (Token): Проверенный токен
+
+    Returns:
+        bool: True, если токен отозван этим вызовом, False - если он уже был отозван
+    """
+    return cache.add(
+        REVOKED_TOKEN_KEY.format(token[api_settings.JTI_CLAIM]),
+        1,
+        timeout=token["exp"] - int(time.time()),
+    )
+
+
+def is_token_revoked(token):
+    """
+    Проверяет, отозван ли токен.
+
+    Args:
+        token (Token): Проверенный токен
+
+    Returns:
+        bool: Признак отзыва
+    """
+    return REVOKED_TOKEN_KEY.format(token[api_settings.JTI_CLAIM]) in cache
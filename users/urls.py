@@ -4,7 +4,8 @@ from rest_framework_simplejwt.views import (TokenObtainPairView,
                                             TokenRefreshView)
 
 from users.apps import UsersConfig
-from users.views import UserCreateAPIView, UserRetrieveAPIView
+from users.views import (TokenRevokeAPIView, UserCreateAPIView,
+                         UserRetrieveAPIView)
 
 app_name = UsersConfig.name
 
@@ -20,5 +21,10 @@ urlpatterns = [
         TokenRefreshView.as_view(permission_classes=[AllowAny]),
         name="token_refresh",
     ),
+    path(
+        "logout/",
+        TokenRevokeAPIView.as_view(permission_classes=[AllowAny]),
+        name="logout",
+    ),
     path("profile/<int:pk>/", UserRetrieveAPIView.as_view(), name="profile"),
 ]
@@ -0,0 +1,21 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.core.exceptions import ValidationError
+
+from users.constans import ERROR_MESSAGES
+
+
+def validate_timezone(value):
+    """
+    Проверяет, что значение является именем часового пояса IANA.
+
+    Args:
+        value (str): Имя часового пояса (например, "Europe/Moscow")
+
+    Raises:
+        ValidationError: Если часовой пояс неизвестен
+    """
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(ERROR_MESSAGES[0])
@@ -1,8 +1,9 @@
 from rest_framework.generics import (CreateAPIView, RetrieveAPIView)
 from rest_framework.permissions import AllowAny
+from rest_framework_simplejwt.views import TokenViewBase
 
 from users.models import User
-from users.serializers import UserSerializer
+from users.serializers import TokenRevokeSerializer, UserSerializer
 
 
 class UserCreateAPIView(CreateAPIView):
@@ -24,3 +25,12 @@ class UserRetrieveAPIView(RetrieveAPIView):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+
+
+class TokenRevokeAPIView(TokenViewBase):
+    """
+    API endpoint для выхода: отзывает переданный refresh-токен.
+    Отозванный токен больше нельзя обменять на новые токены.
+    """
+
+    serializer_class = TokenRevokeSerializer